@@ -16,3 +16,4 @@ class ExceptionCodes(StrEnum):
     PERMISSION_DATA_NOT_FOUND = "permission_data_not_found"
     ORIGINAL_METHOD_NOT_FOUND = "original_method_not_found"
     ORIGINAL_URI_NOT_FOUND = "original_uri_not_found"
+    LOGIN_THROTTLED = "login_throttled"
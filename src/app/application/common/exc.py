@@ -82,3 +82,9 @@ class OriginalMethodNotFound(Exception):
 class OriginalUriNotFound(Exception): 
     def __init__(self, code: ExceptionCodes = ExceptionCodes.ORIGINAL_URI_NOT_FOUND) -> None:
         self.code = code
+
+
+class LoginThrottled(Exception): 
+    def __init__(self, retry_after: int, code: ExceptionCodes = ExceptionCodes.LOGIN_THROTTLED) -> None:
+        self.retry_after = retry_after
+        self.code = code
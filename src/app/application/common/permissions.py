@@ -0,0 +1,44 @@
+from collections.abc import Iterable
+
+
+PERMISSION_FLAGS: tuple[str, ...] = (
+    "is_super_user",
+
+    "personal_data_get",
+    "personal_data_create",
+    "personal_data_update",
+    "personal_data_delete",
+
+    "personal_naks_certification_data_get",
+    "personal_naks_certification_data_create",
+    "personal_naks_certification_data_update",
+    "personal_naks_certification_data_delete",
+
+    "ndt_data_get",
+    "ndt_data_create",
+    "ndt_data_update",
+    "ndt_data_delete",
+
+    "acst_data_get",
+    "acst_data_create",
+    "acst_data_update",
+    "acst_data_delete",
+
+    "acst_file_download",
+    "acst_file_upload",
+
+    "personal_naks_certification_file_download",
+    "personal_naks_certification_file_upload",
+
+    "personal_naks_protocol_file_download",
+    "personal_naks_protocol_file_upload",
+)
+
+
+PERMISSION_BITS: dict[str, int] = {name: 1 << i for i, name in enumerate(PERMISSION_FLAGS)}
+
+SUPER_USER_BIT = PERMISSION_BITS["is_super_user"]
+
+
+def convert_permission_flags_to_mask(flags: Iterable[bool]) -> int:
+    return sum(PERMISSION_BITS[name] for name, value in zip(PERMISSION_FLAGS, flags) if value)
@@ -2,12 +2,16 @@ from app.application.dto.data import (
     UserDTO, 
     CreateUserDTO, 
     CurrentUser, 
+    UserFilterDTO,
     RefreshTokenDTO, 
     CreateRefreshTokenDTO, 
     UpdateRefreshTokenDTO,
     PermissionDTO,
     CreatePermissionDTO,
-    UpdatePermissionDTO
+    UpdatePermissionDTO,
+    PermissionClaims,
+    AccessCheckDTO,
+    AccessCheckResultDTO
 )
 
 
@@ -31,3 +35,4 @@ def convert_refresh_token_dto_to_create_refresh_token_dto(dto: RefreshTokenDTO)
         gen_dt=dto.gen_dt,
         exp_dt=dto.exp_dt
     )
+
@@ -7,6 +7,8 @@ from pydantic import ConfigDict, EmailStr
 from naks_library.utils.validators import plain_datetime_serializer, before_datetime_validator
 from naks_library.common.root import camel_case_alias_generator
 
+from app.application.common.permissions import SUPER_USER_BIT
+
 
 @dataclass(config=ConfigDict(alias_generator=camel_case_alias_generator, populate_by_name=True))
 class UserDTO:
@@ -28,11 +30,20 @@ class CreateUserDTO(UserDTO): ...
 type CurrentUser = UserDTO
 
 
+@dataclass
+class UserFilterDTO:
+    limit: int
+    after_sign_dt: datetime | None = None
+    after_ident: UUID | None = None
+    project: str | None = None
+    login_prefix: str | None = None
+
+
 @dataclass(config=ConfigDict(alias_generator=camel_case_alias_generator, populate_by_name=True))
 class RefreshTokenDTO:
     ident: UUID
     user_ident: UUID
-    token: str
+    token: str | None
     revoked: bool
     gen_dt: Annotated[datetime, plain_datetime_serializer] 
     exp_dt: Annotated[datetime, plain_datetime_serializer]
@@ -131,3 +142,31 @@ class UpdatePermissionDTO:
 
 
 type CurrentUserPermission = PermissionDTO
+
+
+@dataclass
+class PermissionClaims:
+    projects: list[str] | None
+    mask: int
+
+
+    @property
+    def is_super_user(self) -> bool:
+        return bool(self.mask & SUPER_USER_BIT)
+    
+
+    def has(self, bit: int) -> bool:
+        return bool(self.mask & bit)
+
+
+@dataclass
+class AccessCheckDTO:
+    method: str
+    uri: str
+
+
+@dataclass
+class AccessCheckResultDTO:
+    method: str
+    uri: str
+    allowed: bool
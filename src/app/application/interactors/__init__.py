@@ -3,12 +3,16 @@ from app.application.interactors.auth import (
     AuthenticateUserInteractor, 
     UpdateUserTokensInteractor, 
     LogoutUserInteractor, 
-    ValidateAccessInteractor
+    ValidateAccessInteractor,
+    ValidateAccessBatchInteractor
 )
 from app.application.interactors.user import (
     CreateUserInteractor, 
     UpdateUserInteractor, 
     GetUserInteractor, 
+    GetUsersInteractor,
+    ListUsersInteractor,
+    StreamUsersInteractor,
     DeleteUserInteractor
 )
 from app.application.interactors.permission import (
@@ -1,4 +1,3 @@
-import typing as t
 from uuid import UUID, uuid4
 from datetime import timedelta, datetime
 
@@ -16,11 +15,21 @@ from app.application.common.exc import (
     PermissionDataNotFound,
     AccessForbidden
 )
-from app.application.dto import UserDTO, RefreshTokenDTO, PermissionDTO, convert_refresh_token_dto_to_create_refresh_token_dto
+from app.application.dto import (
+    UserDTO, 
+    RefreshTokenDTO, 
+    PermissionClaims,
+    AccessCheckDTO,
+    AccessCheckResultDTO,
+    convert_refresh_token_dto_to_create_refresh_token_dto
+)
 from app.infrastructure.dto import AccessTokenDTO, LoginData
 from app.infrastructure.services.jwt_service import JwtService
-from app.infrastructure.services.hasher import PasswordHasher
-from app.config import ApplicationConfig
+from app.infrastructure.services.hasher import AsyncPasswordHasher
+from app.infrastructure.services.route_matcher import RouteMatcher
+from app.infrastructure.redis.throttle import LoginThrottle
+from app.utils.metrics import PRINCIPAL_CACHE_REQUESTS, PRINCIPAL_CACHE_WRITES
+from app.config import ApplicationConfig, RedisConfig
 
 
 def gen_new_refresh_token(user: UserDTO, jwt_service: JwtService) -> RefreshTokenDTO:
@@ -46,59 +55,106 @@ def gen_new_refresh_token(user: UserDTO, jwt_service: JwtService) -> RefreshToke
     )
 
 
-def gen_new_access_token(user: UserDTO, jwt_service: JwtService) -> AccessTokenDTO:
+def gen_new_access_token(user: UserDTO, jwt_service: JwtService, permission_mask: int | None = None) -> AccessTokenDTO:
         
     gen_dt = datetime.now()
     exp_dt = gen_dt + timedelta(minutes=ApplicationConfig.ACCESS_TOKEN_LIFETIME_MINUTES())
 
+    claims = PermissionClaims(projects=user.projects, mask=permission_mask) if permission_mask is not None else None
+
     access_token = jwt_service.create_access_token(
         user_ident=user.ident,
         gen_dt=gen_dt,
-        exp_dt=exp_dt
+        exp_dt=exp_dt,
+        permissions=claims
     )
 
     return AccessTokenDTO(
         token=access_token,
         user_ident=user.ident,
         gen_dt=gen_dt,
-        exp_dt=exp_dt
+        exp_dt=exp_dt,
+        permissions=claims
     )
 
 
+async def revoke_all_user_tokens(
+    user_ident: UUID,
+    refresh_token_gateway: RefreshTokenGateway,
+    committer: ICommitter,
+    redis_gateway: RedisGateway
+) -> None:
+    revoked_refresh_tokens = await refresh_token_gateway.revoke_all_user_tokens(user_ident)
+
+    await committer.commit()
+
+    await redis_gateway.delete_refresh_tokens(revoked_refresh_tokens)
+
+
+def get_access_token_permission_mask(permission_mask: int | None) -> int | None:
+    if not ApplicationConfig.ACCESS_TOKEN_PERMISSION_CLAIMS():
+        return None
+
+    return permission_mask
+
+
 class LoginUserInteractor:
     def __init__(
         self,
         user_gateway: UserGateway,
         refresh_token_gateway: RefreshTokenGateway,
         committer: ICommitter,
-        jwt_service: JwtService
+        jwt_service: JwtService,
+        hasher: AsyncPasswordHasher,
+        throttle: LoginThrottle,
+        redis_gateway: RedisGateway
     ) -> None:
         self.user_gateway = user_gateway
         self.refresh_token_gateway = refresh_token_gateway
         self.committer = committer
         self.jwt_service = jwt_service
+        self.hasher = hasher
+        self.throttle = throttle
+        self.redis_gateway = redis_gateway
         
 
-    async def __call__(self, data: LoginData) -> tuple[RefreshTokenDTO, AccessTokenDTO]:
-        user = await self.user_gateway.get_by_login(data.login)
+    async def __call__(self, data: LoginData, client_ip: str | None = None) -> tuple[RefreshTokenDTO, AccessTokenDTO]:
+        await self.throttle(data.login, client_ip)
 
-        if not user:
+        res = await self.user_gateway.get_by_login_with_permission_mask(data.login)
+
+        if not res:
             raise UserNotFound(
                 data.login
             )
+        
+        user, permission_mask = res
 
-        if not PasswordHasher().verify(data.password, user.hashed_password):
+        if not await self.hasher.verify(data.password, user.hashed_password):
             raise InvalidPassword
         
-        await self.refresh_token_gateway.revoke_all_user_tokens(user.ident)
-
+        if self.hasher.needs_rehash(user.hashed_password):
+            await self.user_gateway.update(
+                user.ident, 
+                {"hashed_password": await self.hasher.hash(data.password)}
+            )
+        
         refresh_token = gen_new_refresh_token(user, self.jwt_service)
-        access_token = gen_new_access_token(user, self.jwt_service)
+        access_token = gen_new_access_token(
+            user, 
+            self.jwt_service, 
+            get_access_token_permission_mask(permission_mask)
+        )
 
-        await self.refresh_token_gateway.insert(convert_refresh_token_dto_to_create_refresh_token_dto(refresh_token))
+        revoked_refresh_tokens = await self.refresh_token_gateway.rotate(
+            user.ident,
+            convert_refresh_token_dto_to_create_refresh_token_dto(refresh_token)
+        )
 
         await self.committer.commit()
 
+        await self.redis_gateway.delete_refresh_tokens(revoked_refresh_tokens)
+
         return (refresh_token, access_token)
 
 
@@ -108,36 +164,38 @@ class AuthenticateUserInteractor:
         user_gateway: UserGateway,
         refresh_token_gateway: RefreshTokenGateway,
         committer: ICommitter,
-        jwt_service: JwtService
+        jwt_service: JwtService,
+        redis_gateway: RedisGateway
     ) -> None:
         self.user_gateway = user_gateway
         self.refresh_token_gateway = refresh_token_gateway
         self.committer = committer
         self.jwt_service = jwt_service
+        self.redis_gateway = redis_gateway
 
     
     async def __call__(self, refresh_token: RefreshTokenDTO) -> AccessTokenDTO:
         
-        user = await self.user_gateway.get(refresh_token.user_ident)
+        res = await self.user_gateway.get_with_permission_mask(refresh_token.user_ident)
 
-        if not user:
+        if not res:
             raise UserNotFound(refresh_token.user_ident)
         
-
-        if refresh_token.revoked:
-            await self.refresh_token_gateway.revoke_all_user_tokens(user.ident)
-
-            raise RefreshTokenRevoked
+        user, permission_mask = res
         
 
-        if refresh_token.expired:
-            await self.refresh_token_gateway.revoke_all_user_tokens(user.ident)
+        if refresh_token.revoked or refresh_token.expired:
+            await revoke_all_user_tokens(user.ident, self.refresh_token_gateway, self.committer, self.redis_gateway)
 
             raise RefreshTokenRevoked
 
         await self.committer.commit()
 
-        return gen_new_access_token(user, self.jwt_service)
+        return gen_new_access_token(
+            user, 
+            self.jwt_service, 
+            get_access_token_permission_mask(permission_mask)
+        )
         
 
 class UpdateUserTokensInteractor:
@@ -146,34 +204,47 @@ class UpdateUserTokensInteractor:
         user_gateway: UserGateway,
         refresh_token_gateway: RefreshTokenGateway,
         committer: ICommitter,
-        jwt_service: JwtService
+        jwt_service: JwtService,
+        redis_gateway: RedisGateway
     ) -> None:
         self.user_gateway = user_gateway
         self.refresh_token_gateway = refresh_token_gateway
         self.committer = committer
         self.jwt_service = jwt_service
+        self.redis_gateway = redis_gateway
 
     
     async def __call__(self, refresh_token: RefreshTokenDTO) -> tuple[RefreshTokenDTO, AccessTokenDTO]:
         
-        user = await self.user_gateway.get(refresh_token.user_ident)
+        res = await self.user_gateway.get_with_permission_mask(refresh_token.user_ident)
 
-        if not user:
+        if not res:
             raise UserNotFound(refresh_token.user_ident)
         
+        user, permission_mask = res
+        
 
         if refresh_token.revoked:
-            await self.refresh_token_gateway.revoke_all_user_tokens(user.ident)
+            await revoke_all_user_tokens(user.ident, self.refresh_token_gateway, self.committer, self.redis_gateway)
 
             raise RefreshTokenRevoked
 
         refresh_token = gen_new_refresh_token(user, self.jwt_service)
-        access_token = gen_new_access_token(user, self.jwt_service)
+        access_token = gen_new_access_token(
+            user, 
+            self.jwt_service, 
+            get_access_token_permission_mask(permission_mask)
+        )
 
-        await self.refresh_token_gateway.insert(convert_refresh_token_dto_to_create_refresh_token_dto(refresh_token))
+        revoked_refresh_tokens = await self.refresh_token_gateway.rotate(
+            user.ident,
+            convert_refresh_token_dto_to_create_refresh_token_dto(refresh_token)
+        )
 
         await self.committer.commit()
 
+        await self.redis_gateway.delete_refresh_tokens(revoked_refresh_tokens)
+
         return (refresh_token, access_token)
 
 
@@ -181,89 +252,116 @@ class LogoutUserInteractor:
     def __init__(
         self,
         refresh_token_gateway: RefreshTokenGateway,
-        committer: ICommitter
+        committer: ICommitter,
+        redis_gateway: RedisGateway
     ) -> None:
         self.refresh_token_gateway = refresh_token_gateway
         self.committer = committer
+        self.redis_gateway = redis_gateway
 
     
     async def __call__(self, refresh_token: RefreshTokenDTO):
-        await self.refresh_token_gateway.revoke_all_user_tokens(refresh_token.user_ident)
-
-        await self.committer.commit()
+        await revoke_all_user_tokens(refresh_token.user_ident, self.refresh_token_gateway, self.committer, self.redis_gateway)
 
 
-class ValidateAccessInteractor:
+class BaseValidateAccessInteractor:
 
     def __init__(
             self,
             user_gateway: UserGateway,
             permission_gateway: PermissionGateway,
-            redis_gateway: RedisGateway
+            redis_gateway: RedisGateway,
+            route_matcher: RouteMatcher,
+            committer: ICommitter
     ):
         self.user_gateway = user_gateway
         self.permission_gateway = permission_gateway
         self.redis_gateway = redis_gateway
-
-        self.func_map: dict[t.Callable[[PermissionDTO], None]]={
-            "GET-/v1/user": "is_super_user",
-            "PATCH-/v1/user": "is_super_user",
-            "POST-/v1/user": "is_super_user",
-            "DELETE-/v1/user": "is_super_user",
-
-            "GET-/v1/personal": "personal_data_get",
-            "GET-/v1/personal/select": "personal_data_get",
-            "PATCH-/v1/personal": "personal_data_update",
-            "POST-/v1/personal": "personal_data_create",
-            "DELETE-/v1/personal": "personal_data_delete",
-
-            "GET-/v1/ndt": "ndt_data_get",
-            "GET-/v1/ndt/select": "ndt_data_get",
-            "GET-/v1/ndt/personal": "ndt_data_get",
-            "PATCH-/v1/ndt": "ndt_data_update",
-            "POST-/v1/ndt": "ndt_data_create",
-            "DELETE-/v1/ndt": "ndt_data_delete",
-
-            "GET-/v1/personal-naks-certification": "personal_naks_certification_data_get",
-            "GET-/v1/personal-naks-certification/select": "personal_naks_certification_data_get",
-            "GET-/v1/personal-naks-certification/personal": "personal_naks_certification_data_get",
-            "PATCH-/v1/personal-naks-certification": "personal_naks_certification_data_update",
-            "POST-/v1/personal-naks-certification": "personal_naks_certification_data_create",
-            "DELETE-/v1/personal-naks-certification": "personal_naks_certification_data_delete",
-
-            "GET-/v1/acst": "acst_data_get",
-            "GET-/v1/acst/select": "acst_data_get",
-            "PATCH-/v1/acst": "acst_data_update",
-            "POST-/v1/acst": "acst_data_create",
-            "DELETE-/v1/acst": "acst_data_delete"
-        }
+        self.route_matcher = route_matcher
+        self.committer = committer
 
     
-    async def __call__(self, access_token: AccessTokenDTO, request: Request) -> tuple[UserDTO, PermissionDTO]:
-            
+    async def _get_access_token_claims(self, access_token: AccessTokenDTO) -> PermissionClaims:
+
         if access_token.expired:
             raise AccessTokenExpired
         
-        user = await self._get_user(access_token.user_ident)
-        permissions = await self._get_permissions(access_token.user_ident)
+        if access_token.permissions:
+            return access_token.permissions
+        
+        return await self._get_claims(access_token.user_ident)
+    
 
-        if not permissions:
-            raise PermissionDataNotFound(user_ident=access_token.user_ident)
+    def _is_allowed(self, claims: PermissionClaims, method: str, uri: str) -> bool:
 
-        if not user:
-            raise UserNotFound(ident=access_token.user_ident)
+        if claims.is_super_user:
+            return True
+        
+        permission_bit: int | None = self.route_matcher.match(method, uri)
+
+        return permission_bit is not None and claims.has(permission_bit)
     
 
-        await self.redis_gateway.set_permission(access_token.user_ident, permissions)
-        await self.redis_gateway.set_user(access_token.user_ident, user)
+    async def _get_claims(self, user_ident: UUID) -> PermissionClaims:
+
+        refresh_ahead_threshold = RedisConfig.REFRESH_AHEAD_THRESHOLD()
+        
+        cached_user, cached_permission_mask, ttl = await self.redis_gateway.get_principal(
+            user_ident, 
+            with_ttl=refresh_ahead_threshold > 0
+        )
+
+        refresh = ttl is not None and 0 <= ttl < refresh_ahead_threshold
+
+        if cached_user is not None and cached_permission_mask is not None and not refresh:
+            PRINCIPAL_CACHE_REQUESTS.labels(result="hit").inc()
+
+            return PermissionClaims(projects=cached_user.projects, mask=cached_permission_mask)
+
+        PRINCIPAL_CACHE_REQUESTS.labels(result="refresh" if refresh else "miss").inc()
 
+        user_from_db = cached_user is None or refresh
+        mask_from_db = cached_permission_mask is None or refresh
 
-        if permissions.is_super_user:
-            return user, permissions
+        generation = self.redis_gateway.get_principal_generation(user_ident)
+
+        try:
+            user = await self.user_gateway.get(user_ident) if user_from_db else cached_user
+
+            if not user:
+                raise UserNotFound(ident=user_ident)
+
+            permission_mask = await self.permission_gateway.get_mask_by_user_ident(user_ident) if mask_from_db else cached_permission_mask
+        finally:
+            await self.committer.rollback()
+
+        if permission_mask is None:
+            raise PermissionDataNotFound(user_ident=user_ident)
+    
+        await self.redis_gateway.set_principal(
+            user_ident, 
+            user=user if user_from_db else None,
+            permission_mask=permission_mask if mask_from_db else None,
+            generation=generation
+        )
+
+        PRINCIPAL_CACHE_WRITES.inc(user_from_db + mask_from_db)
+
+        return PermissionClaims(projects=user.projects, mask=permission_mask)
+
+
+class ValidateAccessInteractor(BaseValidateAccessInteractor):
+
+    async def __call__(self, access_token: AccessTokenDTO, request: Request) -> PermissionClaims:
+            
+        claims = await self._get_access_token_claims(access_token)
+
+        if claims.is_super_user:
+            return claims
 
         
         original_method = request.headers.get("x-original-method")
-        original_uri = request.headers.get("x-original-uri").split("?")[0]
+        original_uri = request.headers.get("x-original-uri")
 
 
         if not original_method:
@@ -274,30 +372,25 @@ class ValidateAccessInteractor:
             raise OriginalUriNotFound
         
         
-        access_key: str | None = self.func_map.get(f"{original_method}-{original_uri}", None)
-
-        if not getattr(permissions, access_key):
+        if not self._is_allowed(claims, original_method, original_uri):
             raise AccessForbidden()
 
-        return user, permissions
-    
+        return claims
 
-    async def _get_user(self, user_ident: UUID) -> UserDTO | None:
 
-        user = await self.redis_gateway.get_user(user_ident)
+class ValidateAccessBatchInteractor(BaseValidateAccessInteractor):
 
-        if not user:
-            user = await self.user_gateway.get(user_ident)
-    
-        return user
-    
+    async def __call__(self, access_token: AccessTokenDTO, checks: list[AccessCheckDTO]) -> tuple[PermissionClaims, list[AccessCheckResultDTO]]:
 
-    async def _get_permissions(self, user_ident: UUID) -> PermissionDTO | None:
-
-        permissions = await self.redis_gateway.get_permission(user_ident)
-
-        if not permissions:
-            permissions = await self.permission_gateway.get_by_user_ident(user_ident)
-    
-        return permissions
+        claims = await self._get_access_token_claims(access_token)
 
+        return (
+            claims, 
+            [
+                AccessCheckResultDTO(
+                    method=check.method, 
+                    uri=check.uri, 
+                    allowed=self._is_allowed(claims, check.method, check.uri)
+                ) for check in checks
+            ]
+        )
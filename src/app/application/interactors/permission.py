@@ -1,3 +1,5 @@
+from naks_library.interfaces import ICommitter
+
 from app.application.interfaces.gateways import PermissionGateway
 from app.application.dto import UserDTO, PermissionDTO
 
@@ -5,13 +7,18 @@ from app.application.dto import UserDTO, PermissionDTO
 class GetUserPermissionsInteractor:
     def __init__(
         self,
-        permission_gateway: PermissionGateway
+        permission_gateway: PermissionGateway,
+        committer: ICommitter
     ) -> None:
         self.permission_gateway = permission_gateway
+        self.committer = committer
 
 
     async def __call__(
         self,
         user: UserDTO
     ) -> PermissionDTO | None:
-        return await self.permission_gateway.get_by_user_ident(user.ident)
+        try:
+            return await self.permission_gateway.get_by_user_ident(user.ident)
+        finally:
+            await self.committer.rollback()
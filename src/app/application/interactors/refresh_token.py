@@ -1,12 +1,45 @@
+from uuid import UUID
+from datetime import datetime
+
 from naks_library.interactors import BaseGetInteractor, BaseCreateInteractor, BaseUpdateInteractor, BaseDeleteInteractor
 
+from app.application.interfaces.gateways import RefreshTokenGateway, RedisGateway
 from app.application.dto import RefreshTokenDTO, CreateRefreshTokenDTO
+from app.utils.metrics import REFRESH_TOKEN_CACHE_REQUESTS
 
 
 class CreateRefreshTokenInteractor(BaseCreateInteractor[CreateRefreshTokenDTO]): ...
 
 
-class GetRefreshTokenInteractor(BaseGetInteractor[RefreshTokenDTO]): ...
+class GetRefreshTokenInteractor(BaseGetInteractor[RefreshTokenDTO]):
+    def __init__(
+        self,
+        gateway: RefreshTokenGateway,
+        redis_gateway: RedisGateway
+    ) -> None:
+        super().__init__(gateway=gateway)
+        self.redis_gateway = redis_gateway
+
+
+    async def __call__(self, ident: UUID) -> RefreshTokenDTO | None:
+        cached_refresh_token = await self.redis_gateway.get_refresh_token(ident)
+
+        if cached_refresh_token:
+            REFRESH_TOKEN_CACHE_REQUESTS.labels(result="hit").inc()
+
+            return cached_refresh_token
+        
+        REFRESH_TOKEN_CACHE_REQUESTS.labels(result="miss").inc()
+
+        refresh_token = await super().__call__(ident)
+
+        if refresh_token:
+            ttl = int((refresh_token.exp_dt - datetime.now()).total_seconds())
+
+            if ttl > 0:
+                await self.redis_gateway.set_refresh_token(ident, refresh_token, ttl)
+
+        return refresh_token
 
 
 class UpdateRefreshTokenInteractor(BaseUpdateInteractor): ...
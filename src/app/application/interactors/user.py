@@ -1,15 +1,128 @@
+from uuid import UUID
+from dataclasses import replace
+from collections.abc import AsyncIterator
+
+from naks_library.interfaces import ICommitter
 from naks_library.interactors import BaseGetInteractor, BaseCreateInteractor, BaseUpdateInteractor, BaseDeleteInteractor
 
-from app.application.dto import UserDTO, CreateUserDTO
+from app.application.interfaces.gateways import UserGateway, RedisGateway
+from app.application.dto import UserDTO, CreateUserDTO, UserFilterDTO
+from app.infrastructure.services.hasher import AsyncPasswordHasher
+
+
+class CreateUserInteractor(BaseCreateInteractor[CreateUserDTO]):
+    def __init__(
+        self,
+        gateway: UserGateway,
+        committer: ICommitter,
+        hasher: AsyncPasswordHasher
+    ) -> None:
+        super().__init__(gateway=gateway, committer=committer)
+        self.hasher = hasher
+
+
+    async def __call__(self, data: CreateUserDTO, password: str) -> None:
+        await super().__call__(replace(data, hashed_password=await self.hasher.hash(password)))
+
+
+class GetUserInteractor(BaseGetInteractor[UserDTO]):
+    def __init__(
+        self,
+        gateway: UserGateway,
+        committer: ICommitter
+    ) -> None:
+        super().__init__(gateway=gateway)
+        self.committer = committer
+
+
+    async def __call__(self, ident: UUID) -> UserDTO | None:
+        try:
+            return await super().__call__(ident)
+        finally:
+            await self.committer.rollback()
+
+
+class GetUsersInteractor:
+    def __init__(
+        self,
+        gateway: UserGateway,
+        committer: ICommitter
+    ) -> None:
+        self.gateway = gateway
+        self.committer = committer
+
+
+    async def __call__(self, idents: list[UUID]) -> list[UserDTO]:
+        try:
+            return await self.gateway.get_many(idents)
+        finally:
+            await self.committer.rollback()
+
+
+class ListUsersInteractor:
+    def __init__(
+        self,
+        gateway: UserGateway,
+        committer: ICommitter
+    ) -> None:
+        self.gateway = gateway
+        self.committer = committer
+
+
+    async def __call__(self, filters: UserFilterDTO) -> list[UserDTO]:
+        try:
+            return await self.gateway.get_page(filters)
+        finally:
+            await self.committer.rollback()
+
+
+class StreamUsersInteractor(ListUsersInteractor):
+
+    async def __call__(self, filters: UserFilterDTO, batch_size: int = 1000) -> AsyncIterator[UserDTO]:
+        try:
+            async for batch in self.gateway.stream_page(filters, batch_size):
+                for user in batch:
+                    yield user
+        finally:
+            await self.committer.rollback()
+
+
+class UpdateUserInteractor(BaseUpdateInteractor):
+    def __init__(
+        self,
+        gateway: UserGateway,
+        committer: ICommitter,
+        redis_gateway: RedisGateway,
+        hasher: AsyncPasswordHasher
+    ) -> None:
+        super().__init__(gateway=gateway, committer=committer)
+        self.redis_gateway = redis_gateway
+        self.hasher = hasher
+
+
+    async def __call__(self, ident: UUID, data: dict) -> None:
+        password: str | None = data.pop("password", None)
 
+        if password:
+            data["hashed_password"] = await self.hasher.hash(password)
 
-class CreateUserInteractor(BaseCreateInteractor[CreateUserDTO]): ...
+        await super().__call__(ident, data)
 
+        await self.redis_gateway.invalidate_principal(ident)
 
-class GetUserInteractor(BaseGetInteractor[UserDTO]): ...
 
+class DeleteUserInteractor(BaseDeleteInteractor):
+    def __init__(
+        self,
+        gateway: UserGateway,
+        committer: ICommitter,
+        redis_gateway: RedisGateway
+    ) -> None:
+        super().__init__(gateway=gateway, committer=committer)
+        self.redis_gateway = redis_gateway
 
-class UpdateUserInteractor(BaseUpdateInteractor): ...
 
+    async def __call__(self, ident: UUID) -> None:
+        await super().__call__(ident)
 
-class DeleteUserInteractor(BaseDeleteInteractor): ...
+        await self.redis_gateway.invalidate_principal(ident)
@@ -1,11 +1,14 @@
 from uuid import UUID
-from typing import Protocol
+from datetime import datetime
+from typing import Protocol, Sequence
+from collections.abc import AsyncIterator
 
 from naks_library.interfaces import ICrudGateway
 
 from app.application.dto import (
     UserDTO,
     CreateUserDTO,
+    UserFilterDTO,
     RefreshTokenDTO,
     CreateRefreshTokenDTO, 
     PermissionDTO,
@@ -39,16 +42,16 @@ class RedisGateway(Protocol):
     ) -> None: ...
 
 
-    async def get_permission(
+    async def get_permission_mask(
         self,
         ident: UUID
-    ) -> PermissionDTO | None: ...
+    ) -> int | None: ...
 
 
-    async def set_permission(
+    async def set_permission_mask(
         self,
         ident: UUID,
-        data: PermissionDTO
+        mask: int
     ) -> None: ...
 
 
@@ -58,16 +61,45 @@ class RedisGateway(Protocol):
     ) -> None: ...
 
 
+    async def get_principal(
+        self,
+        ident: UUID,
+        with_ttl: bool = False
+    ) -> tuple[UserDTO | None, int | None, int | None]: ...
+
+
+    def get_principal_generation(
+        self,
+        ident: UUID
+    ) -> int | None: ...
+
+
+    async def set_principal(
+        self,
+        ident: UUID,
+        user: UserDTO | None = None,
+        permission_mask: int | None = None,
+        generation: int | None = None
+    ) -> None: ...
+
+
+    async def invalidate_principal(
+        self,
+        ident: UUID
+    ) -> None: ...
+
+
     async def get_refresh_token(
         self,
         ident: UUID
-    ) -> PermissionDTO | None: ...
+    ) -> RefreshTokenDTO | None: ...
 
 
     async def set_refresh_token(
         self,
         ident: UUID,
-        data: PermissionDTO
+        data: RefreshTokenDTO,
+        ttl: int | None = None
     ) -> None: ...
 
 
@@ -77,13 +109,42 @@ class RedisGateway(Protocol):
     ) -> None: ...
 
 
+    async def delete_refresh_tokens(
+        self,
+        idents: list[UUID]
+    ) -> None: ...
+
+
 class UserGateway(ICrudGateway[UserDTO, CreateUserDTO]):
     async def get_by_login(self, login: str) -> UserDTO | None: ...
 
 
+    async def get_with_permission_mask(self, ident: UUID) -> tuple[UserDTO, int | None] | None: ...
+
+
+    async def get_by_login_with_permission_mask(self, login: str) -> tuple[UserDTO, int | None] | None: ...
+
+
+    async def get_many(self, idents: Sequence[UUID]) -> list[UserDTO]: ...
+
+
+    async def get_page(self, filters: UserFilterDTO) -> list[UserDTO]: ...
+
+
+    def stream_page(self, filters: UserFilterDTO, batch_size: int) -> AsyncIterator[list[UserDTO]]: ...
+
+
 class RefreshTokenGateway(ICrudGateway[RefreshTokenDTO, CreateRefreshTokenDTO]): 
-    async def revoke_all_user_tokens(self, ident: UUID): ...
+    async def revoke_all_user_tokens(self, ident: UUID) -> list[UUID]: ...
+
+
+    async def rotate(self, user_ident: UUID, data: CreateRefreshTokenDTO) -> list[UUID]: ...
+
+
+    async def delete_expired(self, before: datetime, limit: int) -> int: ...
 
 
 class PermissionGateway(ICrudGateway[PermissionDTO, CreatePermissionDTO]): 
     async def get_by_user_ident(self, user_ident: UUID) -> PermissionDTO | None: ...
+
+    async def get_mask_by_user_ident(self, user_ident: UUID) -> int | None: ...
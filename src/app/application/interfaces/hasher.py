@@ -8,3 +8,7 @@ class IPasswordHasher(Protocol):
 
     def verify(self, password: str, hashed_password: str) -> bool:
         pass
+
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        pass
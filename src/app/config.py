@@ -1,3 +1,4 @@
+from ipaddress import IPv4Network, IPv6Network, ip_network
 import os
 from pathlib import Path
 
@@ -35,6 +36,36 @@ class DBConfig:
         return os.getenv("DB_PORT")
     
 
+    @classmethod
+    def POOL_MODE(cls) -> str:
+        return os.getenv("DB_POOL_MODE", "queue")
+    
+
+    @classmethod
+    def POOL_SIZE(cls) -> int:
+        return int(os.getenv("DB_POOL_SIZE", 10))
+    
+
+    @classmethod
+    def POOL_MAX_OVERFLOW(cls) -> int:
+        return int(os.getenv("DB_POOL_MAX_OVERFLOW", 10))
+    
+
+    @classmethod
+    def POOL_RECYCLE(cls) -> int:
+        return int(os.getenv("DB_POOL_RECYCLE", 1800))
+    
+
+    @classmethod
+    def POOL_PRE_PING(cls) -> bool:
+        return os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true")
+    
+
+    @classmethod
+    def POOL_TIMEOUT(cls) -> float:
+        return float(os.getenv("DB_POOL_TIMEOUT", 30))
+    
+
     @classmethod
     def DB_URL(cls) -> str:
         return "postgresql+asyncpg://{0}:{1}@{2}:{3}/{4}".format(
@@ -75,7 +106,27 @@ class RedisConfig:
 
     @classmethod
     def CACHE_EXP(cls) -> int:
-        return os.getenv("CACHE_EXP", 900)
+        return int(os.getenv("CACHE_EXP", 6 * 60 * 60))
+    
+
+    @classmethod
+    def REFRESH_AHEAD_THRESHOLD(cls) -> int:
+        return int(os.getenv("REFRESH_AHEAD_THRESHOLD", 0))
+    
+
+    @classmethod
+    def LOCAL_CACHE_SIZE(cls) -> int:
+        return int(os.getenv("LOCAL_CACHE_SIZE", 10000))
+    
+
+    @classmethod
+    def LOCAL_CACHE_TTL(cls) -> int:
+        return int(os.getenv("LOCAL_CACHE_TTL", 60))
+    
+
+    @classmethod
+    def INVALIDATION_CHANNEL(cls) -> str:
+        return os.getenv("INVALIDATION_CHANNEL", "auth:principal-invalidation")
     
 
     @classmethod
@@ -99,8 +150,95 @@ class ApplicationConfig:
     @classmethod
     def REFRESH_TOKEN_LIFETIME_HOURS(cls) -> int:
         return 24
+
+
+    @classmethod
+    def REFRESH_TOKEN_RETENTION_HOURS(cls) -> int:
+        return int(os.getenv("REFRESH_TOKEN_RETENTION_HOURS", 24))
     
+
+    @classmethod
+    def REFRESH_TOKEN_PRUNE_INTERVAL(cls) -> int:
+        return int(os.getenv("REFRESH_TOKEN_PRUNE_INTERVAL", 3600))
     
+
+    @classmethod
+    def REFRESH_TOKEN_PRUNE_BATCH_SIZE(cls) -> int:
+        return int(os.getenv("REFRESH_TOKEN_PRUNE_BATCH_SIZE", 5000))
+
+
+    @classmethod
+    def ACCESS_TOKEN_PERMISSION_CLAIMS(cls) -> bool:
+        return os.getenv("ACCESS_TOKEN_PERMISSION_CLAIMS", "false").lower() in ("1", "true")
+
+    
+    @classmethod
+    def TOKEN_CACHE_SIZE(cls) -> int:
+        return int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+    
+
+    @classmethod
+    def TOKEN_CACHE_TTL(cls) -> int:
+        return int(os.getenv("TOKEN_CACHE_TTL", 300))
+    
+
+    @classmethod
+    def LEGACY_TOKEN_FORMAT_ACCEPTED(cls) -> bool:
+        return os.getenv("LEGACY_TOKEN_FORMAT_ACCEPTED", "true").lower() in ("1", "true")
+    
+    
+    @classmethod
+    def SCRYPT_LOG_N(cls) -> int:
+        return int(os.getenv("SCRYPT_LOG_N", 14))
+    
+
+    @classmethod
+    def SCRYPT_R(cls) -> int:
+        return int(os.getenv("SCRYPT_R", 8))
+    
+
+    @classmethod
+    def SCRYPT_P(cls) -> int:
+        return int(os.getenv("SCRYPT_P", 1))
+    
+
+    @classmethod
+    def HASHER_MAX_WORKERS(cls) -> int:
+        return int(os.getenv("HASHER_MAX_WORKERS", min(4, os.cpu_count() or 1)))
+    
+    
+    @classmethod
+    def LOGIN_THROTTLE_LOGIN_CAPACITY(cls) -> int:
+        return int(os.getenv("LOGIN_THROTTLE_LOGIN_CAPACITY", 10))
+    
+
+    @classmethod
+    def LOGIN_THROTTLE_LOGIN_PER_MINUTE(cls) -> int:
+        return int(os.getenv("LOGIN_THROTTLE_LOGIN_PER_MINUTE", 5))
+    
+
+    @classmethod
+    def LOGIN_THROTTLE_IP_CAPACITY(cls) -> int:
+        return int(os.getenv("LOGIN_THROTTLE_IP_CAPACITY", 100))
+    
+
+    @classmethod
+    def LOGIN_THROTTLE_IP_PER_MINUTE(cls) -> int:
+        return int(os.getenv("LOGIN_THROTTLE_IP_PER_MINUTE", 60))
+    
+
+    @classmethod
+    def TRUSTED_PROXIES(cls) -> list[IPv4Network | IPv6Network]:
+        return [ip_network(el.strip()) for el in os.getenv("TRUSTED_PROXIES", "").split(",") if el.strip()]
+    
+
+    @classmethod
+    def PROMETHEUS_MULTIPROC_DIR(cls) -> Path | None:
+        path = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+        return Path(path) if path else None
+    
+
     @classmethod
     def DOMAIN(cls) -> str:
         return os.getenv("DOMAIN")
@@ -113,7 +251,36 @@ class ApplicationConfig:
 
     @classmethod
     def ALGORITHM(cls) -> str:
-        return "HS256"
+        return os.getenv("JWT_ALGORITHM", "HS256")
+    
+
+    @classmethod
+    def JWT_PRIVATE_KEY_PATH(cls) -> Path | None:
+        path = os.getenv("JWT_PRIVATE_KEY_PATH")
+
+        return Path(path) if path else None
+    
+
+    @classmethod
+    def JWT_ACCEPT_LEGACY_HS256(cls) -> bool:
+        return os.getenv("JWT_ACCEPT_LEGACY_HS256", "false").lower() in ("1", "true")
+    
+
+    @classmethod
+    def JWT_PREVIOUS_PUBLIC_KEY_PATHS(cls) -> list[Path]:
+        return [Path(path.strip()) for path in os.getenv("JWT_PREVIOUS_PUBLIC_KEY_PATHS", "").split(",") if path.strip()]
+    
+
+    @classmethod
+    def JWKS_MAX_AGE(cls) -> int:
+        return int(os.getenv("JWKS_MAX_AGE", 3600))
+    
+
+    @classmethod
+    def ACCESS_RULES_PATH(cls) -> Path:
+        path = os.getenv("ACCESS_RULES_PATH")
+
+        return Path(path) if path else cls.BASE_DIR() / "app" / "access_rules.json"
     
 
     @classmethod
@@ -0,0 +1,42 @@
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.utils.metrics import STAGE_SECONDS
+
+
+class InstrumentedSession(Session): ...
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    STAGE_SECONDS.labels(stage="db_query").observe(perf_counter() - conn.info["query_start"].pop())
+
+
+def handle_error(context) -> None:
+    if context.connection is not None and context.connection.info.get("query_start"):
+        context.connection.info["query_start"].pop()
+
+
+@event.listens_for(InstrumentedSession, "before_commit")
+def before_commit(session: Session) -> None:
+    session.info["commit_start"] = perf_counter()
+
+
+@event.listens_for(InstrumentedSession, "after_commit")
+def after_commit(session: Session) -> None:
+    start = session.info.pop("commit_start", None)
+
+    if start is not None:
+        STAGE_SECONDS.labels(stage="commit").observe(perf_counter() - start)
@@ -1,17 +1,61 @@
 from uuid import UUID
+from typing import Sequence, Any, Callable
+from collections.abc import AsyncIterator
+from datetime import datetime
+from hashlib import sha256
+from dataclasses import asdict
+from itertools import batched
 
 from naks_library.crud_mapper import SqlAlchemyCrudMapper
-from sqlalchemy import update, select
+from sqlalchemy import update, select, delete, insert, tuple_, ColumnElement, Select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.dto import (
     UserDTO, 
     CreateUserDTO, 
+    UserFilterDTO,
     RefreshTokenDTO,
     CreateRefreshTokenDTO,
     PermissionDTO,
     CreatePermissionDTO
 )
-from app.infrastructure.database.models import UserModel, RefreshTokenModel, PermissionModel
+from app.application.common.permissions import PERMISSION_FLAGS, convert_permission_flags_to_mask
+from app.infrastructure.database.models import Base, UserModel, RefreshTokenModel, PermissionModel
+
+
+MAX_BIND_PARAMETERS = 32767
+
+
+def hash_refresh_token(token: str) -> bytes:
+    return sha256(token.encode()).digest()
+
+
+async def upsert_many(session: AsyncSession, model: type[Base], data: Sequence[Any], conflict_column: str = "ident") -> int:
+    columns = model.__table__.c
+    rows = {
+        row[conflict_column]: row for row in (
+            {key: value for key, value in asdict(el).items() if key in columns} for el in data
+        )
+    }
+
+    for chunk in batched(rows.values(), MAX_BIND_PARAMETERS // len(columns)):
+        stmt = pg_insert(model).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[columns[conflict_column]],
+            set_={column.name: stmt.excluded[column.name] for column in columns if not column.primary_key and column.name != conflict_column}
+        )
+
+        await session.execute(stmt)
+
+    return len(rows)
+
+
+async def stream_batches[T](session: AsyncSession, stmt: Select, convert: Callable[[Any], T], batch_size: int) -> AsyncIterator[list[T]]:
+    res = await session.stream_scalars(stmt.execution_options(yield_per=batch_size))
+
+    async for partition in res.partitions():
+        yield [convert(row) for row in partition]
 
 
 class UserMapper(SqlAlchemyCrudMapper[UserDTO, CreateUserDTO]):
@@ -28,6 +72,83 @@ class UserMapper(SqlAlchemyCrudMapper[UserDTO, CreateUserDTO]):
             return self._convert(res)
 
 
+    async def get_with_permission_mask(self, ident: UUID) -> tuple[UserDTO, int | None] | None:
+        return await self._get_with_permission_mask(UserModel.ident == ident)
+
+
+    async def get_by_login_with_permission_mask(self, login: str) -> tuple[UserDTO, int | None] | None:
+        return await self._get_with_permission_mask(UserModel.login == login)
+
+
+    async def _get_with_permission_mask(self, condition: ColumnElement[bool]) -> tuple[UserDTO, int | None] | None:
+        stmt = select(
+            UserModel,
+            PermissionModel.ident,
+            *(getattr(PermissionModel, name) for name in PERMISSION_FLAGS)
+        ).outerjoin(
+            PermissionModel, 
+            PermissionModel.user_ident == UserModel.ident
+        ).where(
+            condition
+        )
+
+        res = (await self.session.execute(stmt)).one_or_none()
+
+        if res is None:
+            return None
+        
+        user, permission_ident, *flags = res
+
+        return (
+            self._convert(user),
+            convert_permission_flags_to_mask(flags) if permission_ident is not None else None
+        )
+
+
+    async def upsert_many(self, data: Sequence[CreateUserDTO]) -> int:
+        return await upsert_many(self.session, UserModel, data)
+
+
+    def stream_all(self, batch_size: int) -> AsyncIterator[list[UserDTO]]:
+        return stream_batches(self.session, select(UserModel).order_by(UserModel.ident), self._convert, batch_size)
+
+
+    async def get_many(self, idents: Sequence[UUID]) -> list[UserDTO]:
+        stmt = select(UserModel).where(
+            UserModel.ident.in_(idents)
+        )
+
+        return [self._convert(row) for row in (await self.session.execute(stmt)).scalars()]
+
+
+    async def get_page(self, filters: UserFilterDTO) -> list[UserDTO]:
+        return [self._convert(row) for row in (await self.session.execute(self._page_stmt(filters))).scalars()]
+
+
+    def stream_page(self, filters: UserFilterDTO, batch_size: int) -> AsyncIterator[list[UserDTO]]:
+        return stream_batches(self.session, self._page_stmt(filters), self._convert, batch_size)
+
+
+    def _page_stmt(self, filters: UserFilterDTO) -> Select:
+        stmt = select(UserModel).order_by(
+            UserModel.sign_dt, 
+            UserModel.ident
+        ).limit(
+            filters.limit
+        )
+
+        if filters.after_sign_dt is not None and filters.after_ident is not None:
+            stmt = stmt.where(tuple_(UserModel.sign_dt, UserModel.ident) > (filters.after_sign_dt, filters.after_ident))
+
+        if filters.project is not None:
+            stmt = stmt.where(UserModel.projects.contains([filters.project]))
+
+        if filters.login_prefix:
+            stmt = stmt.where(UserModel.login.startswith(filters.login_prefix, autoescape=True))
+
+        return stmt
+
+
     def _convert(self, row: UserModel) -> UserDTO:
         return UserDTO(
             ident=row.ident,
@@ -46,18 +167,104 @@ class RefreshTokenMapper(SqlAlchemyCrudMapper[RefreshTokenDTO, CreateRefreshToke
     __model__ = RefreshTokenModel
 
 
-    async def revoke_all_user_tokens(self, ident: UUID):
+    async def insert(self, data: CreateRefreshTokenDTO) -> None:
+        stmt = insert(RefreshTokenModel).values(
+            ident=data.ident,
+            user_ident=data.user_ident,
+            token_hash=hash_refresh_token(data.token),
+            revoked=data.revoked,
+            gen_dt=data.gen_dt,
+            exp_dt=data.exp_dt
+        )
+
+        await self.session.execute(stmt)
+
+
+    async def revoke_all_user_tokens(self, ident: UUID) -> list[UUID]:
         stmt = update(RefreshTokenModel).where(
-            RefreshTokenModel.user_ident == ident
+            RefreshTokenModel.user_ident == ident,
+            RefreshTokenModel.revoked.is_(False),
+            RefreshTokenModel.exp_dt > datetime.now()
         ).values(
             revoked=True
+        ).returning(
+            RefreshTokenModel.ident
+        ).execution_options(
+            synchronize_session=False
         )
 
-        await self.session.execute(stmt)
+        return list((await self.session.execute(stmt)).scalars())
+
+
+    async def rotate(self, user_ident: UUID, data: CreateRefreshTokenDTO) -> list[UUID]:
+        revoked = update(RefreshTokenModel).where(
+            RefreshTokenModel.user_ident == user_ident,
+            RefreshTokenModel.revoked.is_(False),
+            RefreshTokenModel.exp_dt > datetime.now()
+        ).values(
+            revoked=True
+        ).returning(
+            RefreshTokenModel.ident
+        ).cte(
+            "revoked"
+        )
+
+        inserted = insert(RefreshTokenModel).values(
+            ident=data.ident,
+            user_ident=data.user_ident,
+            token_hash=hash_refresh_token(data.token),
+            revoked=data.revoked,
+            gen_dt=data.gen_dt,
+            exp_dt=data.exp_dt
+        ).returning(
+            RefreshTokenModel.ident
+        ).cte(
+            "inserted"
+        )
+
+        stmt = select(revoked.c.ident).add_cte(inserted)
+
+        return list((await self.session.execute(stmt)).scalars())
+
+
+    def stream_active(self, batch_size: int) -> AsyncIterator[list[RefreshTokenDTO]]:
+        stmt = select(RefreshTokenModel).where(
+            RefreshTokenModel.revoked.is_(False),
+            RefreshTokenModel.exp_dt > datetime.now()
+        ).order_by(
+            RefreshTokenModel.ident
+        )
+
+        return stream_batches(self.session, stmt, self._convert, batch_size)
+
+
+    async def delete_expired(self, before: datetime, limit: int) -> int:
+        batch = select(RefreshTokenModel.ident).where(
+            RefreshTokenModel.exp_dt < before
+        ).limit(
+            limit
+        ).with_for_update(
+            skip_locked=True
+        )
+
+        stmt = delete(RefreshTokenModel).where(
+            RefreshTokenModel.ident.in_(batch.scalar_subquery())
+        ).execution_options(
+            synchronize_session=False
+        )
+
+        return (await self.session.execute(stmt)).rowcount
 
 
     def _convert(self, row: RefreshTokenModel) -> RefreshTokenDTO:
-        return RefreshTokenDTO(**row.__dict__)
+        return RefreshTokenDTO(
+            ident=row.ident,
+            user_ident=row.user_ident,
+            token=row.token,
+            revoked=row.revoked,
+            gen_dt=row.gen_dt,
+            exp_dt=row.exp_dt
+        )
 
 
 class PermissionMapper(SqlAlchemyCrudMapper[PermissionDTO, CreatePermissionDTO]):
@@ -74,5 +281,25 @@ class PermissionMapper(SqlAlchemyCrudMapper[PermissionDTO, CreatePermissionDTO])
             return self._convert(res)
 
 
+    async def get_mask_by_user_ident(self, user_ident: UUID) -> int | None:
+        stmt = select(
+            *(getattr(PermissionModel, name) for name in PERMISSION_FLAGS)
+        ).where(
+            PermissionModel.user_ident == user_ident
+        )
+        res = (await self.session.execute(stmt)).one_or_none()
+
+        if res:
+            return convert_permission_flags_to_mask(res)
+
+
+    async def upsert_many(self, data: Sequence[CreatePermissionDTO]) -> int:
+        return await upsert_many(self.session, PermissionModel, data, conflict_column="user_ident")
+
+
+    def stream_all(self, batch_size: int) -> AsyncIterator[list[PermissionDTO]]:
+        return stream_batches(self.session, select(PermissionModel).order_by(PermissionModel.ident), self._convert, batch_size)
+
+
     def _convert(self, row: PermissionModel) -> PermissionDTO:
         return PermissionDTO(**row.__dict__)
@@ -0,0 +1,34 @@
+"""partial index on active refresh tokens
+
+Revision ID: 5c2e7a91d4b3
+Revises: 137416d523a3
+Create Date: 2026-10-17 10:12:41.305118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e7a91d4b3'
+down_revision: Union[str, None] = '137416d523a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'refresh_token_active_idx', 
+        'refresh_token_table', 
+        ['user_ident', 'exp_dt'], 
+        unique=False, 
+        postgresql_where=sa.text('revoked IS false')
+    )
+    op.drop_index('revoked_idx', table_name='refresh_token_table')
+
+
+def downgrade() -> None:
+    op.create_index('revoked_idx', 'refresh_token_table', ['revoked'], unique=False)
+    op.drop_index('refresh_token_active_idx', table_name='refresh_token_table')
@@ -0,0 +1,26 @@
+"""refresh token exp_dt index
+
+Revision ID: a83d0f6b2c17
+Revises: 5c2e7a91d4b3
+Create Date: 2026-10-17 11:04:18.527390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a83d0f6b2c17'
+down_revision: Union[str, None] = '5c2e7a91d4b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('refresh_token_exp_dt_idx', 'refresh_token_table', ['exp_dt'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('refresh_token_exp_dt_idx', table_name='refresh_token_table')
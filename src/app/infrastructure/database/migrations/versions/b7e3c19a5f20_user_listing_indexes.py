@@ -0,0 +1,30 @@
+"""user listing indexes
+
+Revision ID: b7e3c19a5f20
+Revises: d41f6c0e9a58
+Create Date: 2026-10-17 16:42:09.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3c19a5f20'
+down_revision: Union[str, None] = 'd41f6c0e9a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('user_sign_dt_ident_idx', 'user_table', ['sign_dt', 'ident'], unique=False)
+    op.create_index('user_login_pattern_idx', 'user_table', ['login'], unique=False, postgresql_ops={'login': 'varchar_pattern_ops'})
+    op.create_index('user_projects_gin_idx', 'user_table', ['projects'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('user_projects_gin_idx', table_name='user_table', postgresql_using='gin')
+    op.drop_index('user_login_pattern_idx', table_name='user_table', postgresql_ops={'login': 'varchar_pattern_ops'})
+    op.drop_index('user_sign_dt_ident_idx', table_name='user_table')
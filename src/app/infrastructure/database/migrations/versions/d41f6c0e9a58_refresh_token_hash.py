@@ -0,0 +1,36 @@
+"""store refresh token digest
+
+Revision ID: d41f6c0e9a58
+Revises: a83d0f6b2c17
+Create Date: 2026-10-17 12:20:05.914427
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f6c0e9a58'
+down_revision: Union[str, None] = 'a83d0f6b2c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('refresh_token_table', sa.Column('token_hash', sa.LargeBinary(length=32), nullable=True))
+    op.execute("UPDATE refresh_token_table SET token_hash = sha256(convert_to(token, 'UTF8')) WHERE token IS NOT NULL")
+    op.create_index('refresh_token_token_hash_idx', 'refresh_token_table', ['token_hash'], unique=True)
+    op.drop_index('token_idx', table_name='refresh_token_table')
+    op.drop_constraint('refresh_token_table_token_key', 'refresh_token_table', type_='unique')
+    op.alter_column('refresh_token_table', 'token', existing_type=sa.String(), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM refresh_token_table WHERE token IS NULL")
+    op.alter_column('refresh_token_table', 'token', existing_type=sa.String(), nullable=False)
+    op.create_unique_constraint('refresh_token_table_token_key', 'refresh_token_table', ['token'])
+    op.create_index('token_idx', 'refresh_token_table', ['token'], unique=False)
+    op.drop_index('refresh_token_token_hash_idx', table_name='refresh_token_table')
+    op.drop_column('refresh_token_table', 'token_hash')
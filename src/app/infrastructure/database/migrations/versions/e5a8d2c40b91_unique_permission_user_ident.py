@@ -0,0 +1,35 @@
+"""unique permission per user
+
+Revision ID: e5a8d2c40b91
+Revises: b7e3c19a5f20
+Create Date: 2026-10-17 19:05:37.402816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a8d2c40b91'
+down_revision: Union[str, None] = 'b7e3c19a5f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(
+        sa.text("SELECT user_ident FROM permission_table GROUP BY user_ident HAVING count(*) > 1 LIMIT 10")
+    ).scalars().all()
+
+    if duplicates:
+        raise RuntimeError(f"permission_table has several rows for users ({', '.join(str(el) for el in duplicates)}); remove the duplicates before upgrading")
+
+    op.drop_index('permission_user_ident_idx', table_name='permission_table')
+    op.create_index('permission_user_ident_idx', 'permission_table', ['user_ident'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('permission_user_ident_idx', table_name='permission_table')
+    op.create_index('permission_user_ident_idx', 'permission_table', ['user_ident'], unique=False)
@@ -33,7 +33,10 @@ class UserModel(Base):
     __table_args__ = (
         Index("user_ident_idx", ident),
         Index("user_login_idx", login),
-        Index("user_projects_idx", projects)
+        Index("user_projects_idx", projects),
+        Index("user_projects_gin_idx", projects, postgresql_using="gin"),
+        Index("user_sign_dt_ident_idx", sign_dt, ident),
+        Index("user_login_pattern_idx", login, postgresql_ops={"login": "varchar_pattern_ops"})
     )
 
 
@@ -42,7 +45,8 @@ class RefreshTokenModel(Base):
 
     ident: Mapped[uuid.UUID] = sa.Column(sa.UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
     user_ident: Mapped[uuid.UUID] = sa.Column(sa.UUID(as_uuid=True), sa.ForeignKey("user_table.ident", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    token: Mapped[str] = sa.Column(sa.String(), nullable=False, unique=True)
+    token: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    token_hash: Mapped[bytes | None] = sa.Column(sa.LargeBinary(32), nullable=True)
     revoked: Mapped[bool] = sa.Column(sa.Boolean(), nullable=False)
     exp_dt: Mapped[datetime] = sa.Column(sa.DateTime(), nullable=False)
     gen_dt: Mapped[datetime] = sa.Column(sa.DateTime(), nullable=False)
@@ -50,8 +54,9 @@ class RefreshTokenModel(Base):
     __table_args__ = (
         Index("refresh_token_ident_idx", ident),
         Index("refresh_token_user_ident_idx", user_ident),
-        Index("token_idx", token),
-        Index("revoked_idx", revoked)
+        Index("refresh_token_token_hash_idx", token_hash, unique=True),
+        Index("refresh_token_active_idx", user_ident, exp_dt, postgresql_where=revoked.is_(False)),
+        Index("refresh_token_exp_dt_idx", exp_dt)
     )
 
 
@@ -95,5 +100,5 @@ class PermissionModel(Base):
 
     __table_args__ = (
         Index("permission_ident_idx", ident),
-        Index("permission_user_ident_idx", user_ident)
+        Index("permission_user_ident_idx", user_ident, unique=True)
     )
@@ -0,0 +1,52 @@
+from time import perf_counter
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from app.utils.metrics import DB_POOL_CHECKED_OUT, DB_POOL_IDLE, DB_POOL_CAPACITY, DB_POOL_WAIT_SECONDS
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        self._capacity = self.size() + max(self._max_overflow, 0)
+        self._checked_out = 0
+        self._idle = 0
+
+        DB_POOL_CAPACITY.inc(self._capacity)
+        self._update_gauges()
+
+
+    def dispose(self) -> None:
+        super().dispose()
+
+        DB_POOL_CAPACITY.dec(self._capacity)
+        self._capacity = 0
+        self._update_gauges()
+
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = perf_counter()
+
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT_SECONDS.observe(perf_counter() - start)
+            self._update_gauges()
+
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        try:
+            super()._do_return_conn(record)
+        finally:
+            self._update_gauges()
+
+
+    def _update_gauges(self) -> None:
+        checked_out, idle = self.checkedout(), self.checkedin()
+
+        DB_POOL_CHECKED_OUT.inc(checked_out - self._checked_out)
+        DB_POOL_IDLE.inc(idle - self._idle)
+
+        self._checked_out, self._idle = checked_out, idle
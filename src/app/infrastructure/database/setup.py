@@ -1,16 +1,38 @@
 from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy import NullPool
 
+from app.infrastructure.database.pool import InstrumentedAsyncPool
+from app.infrastructure.database.instrumentation import InstrumentedSession, instrument_engine
 from app.config import DBConfig
 
 
-def create_engine(echo: bool = False) -> AsyncEngine:
-    return create_async_engine(
-        DBConfig.DB_URL(),
-        poolclass=NullPool,
-        echo=echo
-    )
+def create_engine(echo: bool = False, pool_mode: str | None = None) -> AsyncEngine:
+    pool_mode = pool_mode or DBConfig.POOL_MODE()
+
+    if pool_mode == "null":
+        engine = create_async_engine(
+            DBConfig.DB_URL(),
+            poolclass=NullPool,
+            echo=echo
+        )
+    elif pool_mode == "queue":
+        engine = create_async_engine(
+            DBConfig.DB_URL(),
+            poolclass=InstrumentedAsyncPool,
+            pool_size=DBConfig.POOL_SIZE(),
+            max_overflow=DBConfig.POOL_MAX_OVERFLOW(),
+            pool_recycle=DBConfig.POOL_RECYCLE(),
+            pool_pre_ping=DBConfig.POOL_PRE_PING(),
+            pool_timeout=DBConfig.POOL_TIMEOUT(),
+            echo=echo
+        )
+    else:
+        raise ValueError(f"unknown pool mode ({pool_mode}); expected 'queue' or 'null'")
+    
+    instrument_engine(engine.sync_engine)
+
+    return engine
 
 
 def create_session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
-    return async_sessionmaker(engine, autocommit=False, autoflush=False, expire_on_commit=False)
+    return async_sessionmaker(engine, autocommit=False, autoflush=False, expire_on_commit=False, sync_session_class=InstrumentedSession)
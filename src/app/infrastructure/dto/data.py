@@ -4,6 +4,8 @@ from datetime import datetime, UTC
 from pydantic.dataclasses import dataclass
 from pydantic import BaseModel
 
+from app.application.dto import PermissionClaims
+
 
 class LoginData(BaseModel):
     login: str
@@ -16,8 +18,9 @@ class AccessTokenDTO:
     user_ident: UUID
     gen_dt: datetime
     exp_dt: datetime
+    permissions: PermissionClaims | None = None
 
 
     @property
     def expired(self) -> bool:
-        return datetime.now(UTC).replace(tzinfo=None) > self.exp_dt
\ No newline at end of file
+        return datetime.now(UTC).replace(tzinfo=None) > self.exp_dt
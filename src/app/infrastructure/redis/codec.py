@@ -0,0 +1,98 @@
+from uuid import UUID
+from datetime import datetime
+
+import msgpack
+
+from app.application.dto import UserDTO, RefreshTokenDTO
+
+
+CACHE_SCHEMA_VERSION = 1
+CACHE_SCHEMA_PREFIX = bytes([CACHE_SCHEMA_VERSION])
+
+
+def construct[T](cls: type[T], **values) -> T:
+    obj = object.__new__(cls)
+    obj.__dict__.update(values)
+
+    return obj
+
+
+def pack(values: list) -> bytes:
+    return CACHE_SCHEMA_PREFIX + msgpack.packb(values)
+
+
+def unpack(data: bytes) -> list | None:
+    if not data.startswith(CACHE_SCHEMA_PREFIX):
+        return None
+
+    return msgpack.unpackb(memoryview(data)[1:])
+
+
+def encode_user(user: UserDTO) -> bytes:
+    return pack(
+        [
+            user.ident.bytes,
+            user.login,
+            user.name,
+            user.email,
+            user.projects,
+            user.hashed_password,
+            user.sign_dt.isoformat(),
+            user.update_dt.isoformat(),
+            user.login_dt.isoformat()
+        ]
+    )
+
+
+def decode_user(data: bytes) -> UserDTO | None:
+    values = unpack(data)
+
+    if values is None:
+        return None
+
+    ident, login, name, email, projects, hashed_password, sign_dt, update_dt, login_dt = values
+
+    return construct(
+        UserDTO,
+        ident=UUID(bytes=ident),
+        login=login,
+        name=name,
+        email=email,
+        projects=projects,
+        hashed_password=hashed_password,
+        sign_dt=datetime.fromisoformat(sign_dt),
+        update_dt=datetime.fromisoformat(update_dt),
+        login_dt=datetime.fromisoformat(login_dt)
+    )
+
+
+def encode_refresh_token(refresh_token: RefreshTokenDTO) -> bytes:
+    return pack(
+        [
+            refresh_token.ident.bytes,
+            refresh_token.user_ident.bytes,
+            refresh_token.token,
+            refresh_token.revoked,
+            refresh_token.gen_dt.isoformat(),
+            refresh_token.exp_dt.isoformat()
+        ]
+    )
+
+
+def decode_refresh_token(data: bytes) -> RefreshTokenDTO | None:
+    values = unpack(data)
+
+    if values is None:
+        return None
+
+    ident, user_ident, token, revoked, gen_dt, exp_dt = values
+
+    return construct(
+        RefreshTokenDTO,
+        ident=UUID(bytes=ident),
+        user_ident=UUID(bytes=user_ident),
+        token=token,
+        revoked=revoked,
+        gen_dt=datetime.fromisoformat(gen_dt),
+        exp_dt=datetime.fromisoformat(exp_dt)
+    )
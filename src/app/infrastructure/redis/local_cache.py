@@ -0,0 +1,92 @@
+from uuid import UUID
+import logging
+import asyncio
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.application.dto import UserDTO
+from app.utils.ttl_cache import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class PrincipalCache:
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.users = TTLCache[UUID, UserDTO](maxsize=maxsize, ttl=ttl)
+        self.permission_masks = TTLCache[UUID, int](maxsize=maxsize, ttl=ttl)
+        self.generations = TTLCache[UUID, int](maxsize=maxsize, ttl=ttl)
+        self.epoch = 0
+        self.cleared_epoch = 0
+
+
+    def get(self, ident: UUID) -> tuple[UserDTO | None, int | None]:
+        return self.users.get(ident), self.permission_masks.get(ident)
+
+
+    def generation(self, ident: UUID) -> int:
+        return max(self.generations.get(ident) or 0, self.cleared_epoch)
+
+
+    def set(
+        self,
+        ident: UUID,
+        user: UserDTO | None = None,
+        permission_mask: int | None = None,
+        generation: int | None = None
+    ) -> None:
+        if generation is not None and generation != self.generation(ident):
+            return
+
+        if user is not None:
+            self.users.set(ident, user)
+
+        if permission_mask is not None:
+            self.permission_masks.set(ident, permission_mask)
+
+
+    def invalidate(self, ident: UUID) -> None:
+        self.epoch += 1
+        self.generations.set(ident, self.epoch)
+
+        self.users.delete(ident)
+        self.permission_masks.delete(ident)
+
+
+    def clear(self) -> None:
+        self.epoch += 1
+        self.cleared_epoch = self.epoch
+        self.generations.clear()
+
+        self.users.clear()
+        self.permission_masks.clear()
+
+
+    async def listen(self, redis_engine: Redis, channel: str, retry_interval: float = 1) -> None:
+        while True:
+            try:
+                async with redis_engine.pubsub() as pubsub:
+                    await pubsub.subscribe(channel)
+
+                    self.clear()
+
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+
+                        data = message["data"]
+
+                        try:
+                            ident = UUID(hex=data.decode() if isinstance(data, bytes) else data)
+                        except (ValueError, UnicodeDecodeError):
+                            logger.warning("skipping invalid principal invalidation message (%r)", data)
+                            continue
+
+                        self.invalidate(ident)
+
+            except (RedisError, OSError):
+                self.clear()
+
+                await asyncio.sleep(retry_interval)
@@ -1,16 +1,23 @@
 from uuid import UUID
+from collections.abc import Iterable
 
 from redis.asyncio import Redis
-from pydantic import RootModel
 
-from app.application.dto import UserDTO, PermissionDTO, RefreshTokenDTO
+from app.application.dto import UserDTO, RefreshTokenDTO
+from app.infrastructure.redis.local_cache import PrincipalCache
+from app.infrastructure.redis.codec import encode_user, decode_user, encode_refresh_token, decode_refresh_token
+from app.utils.metrics import PRINCIPAL_LOCAL_CACHE_REQUESTS, observe_stage
 from app.config import RedisConfig
 
 
+REVOKED_REFRESH_TOKEN = b""
+
+
 class RedisMapper:
 
-    def __init__(self, redis_engine: Redis):
+    def __init__(self, redis_engine: Redis, local_cache: PrincipalCache | None = None):
         self.redis_engine = redis_engine
+        self.local_cache = local_cache
 
 
     async def get_user(
@@ -20,7 +27,7 @@ class RedisMapper:
         res = await self._get(f"user:{ident.hex}")
 
         if res:
-            return RootModel[UserDTO].model_validate_json(res).root
+            return decode_user(res)
 
 
     async def set_user(
@@ -31,7 +38,7 @@ class RedisMapper:
 
         await self._set(
             f"user:{ident.hex}", 
-            RootModel[UserDTO](data).model_dump_json()
+            encode_user(data)
         )
 
 
@@ -42,25 +49,25 @@ class RedisMapper:
         await self._delete(f"user:{ident.hex}")
 
 
-    async def get_permission(
+    async def get_permission_mask(
         self,
         ident: UUID
-    ) -> PermissionDTO | None:
-        res = await self._get(f"permission:{ident.hex}")
+    ) -> int | None:
+        res = await self._get(f"permission-mask:{ident.hex}")
 
-        if res:
-            return RootModel[PermissionDTO].model_validate_json(res).root
+        if res is not None:
+            return int(res)
 
 
-    async def set_permission(
+    async def set_permission_mask(
         self,
         ident: UUID,
-        data: PermissionDTO
+        mask: int
     ) -> None:
 
         await self._set(
-            f"permission:{ident.hex}", 
-            RootModel[PermissionDTO](data).model_dump_json()
+            f"permission-mask:{ident.hex}", 
+            str(mask)
         )
 
 
@@ -68,55 +75,175 @@ class RedisMapper:
         self,
         ident: UUID
     ) -> None:
-        await self._delete(f"permission:{ident.hex}")
+        await self._delete(f"permission-mask:{ident.hex}")
+
+
+    async def get_principal(
+        self,
+        ident: UUID,
+        with_ttl: bool = False
+    ) -> tuple[UserDTO | None, int | None, int | None]:
+        if self.local_cache:
+            user, permission_mask = self.local_cache.get(ident)
+
+            if user is not None and permission_mask is not None:
+                PRINCIPAL_LOCAL_CACHE_REQUESTS.labels(result="hit").inc()
+                return user, permission_mask, None
+            
+            PRINCIPAL_LOCAL_CACHE_REQUESTS.labels(result="miss").inc()
+
+            generation = self.local_cache.generation(ident)
+
+        user_key = f"user:{ident.hex}"
+        permission_mask_key = f"permission-mask:{ident.hex}"
+
+        with observe_stage("redis_get"):
+            if with_ttl:
+                async with self.redis_engine.pipeline(transaction=False) as pipe:
+                    pipe.mget(user_key, permission_mask_key)
+                    pipe.ttl(user_key)
+                    pipe.ttl(permission_mask_key)
+
+                    (user, permission_mask), *ttls = await pipe.execute()
+
+                ttl = min((ttl for ttl in ttls if ttl >= 0), default=None)
+            else:
+                user, permission_mask = await self.redis_engine.mget(user_key, permission_mask_key)
+                ttl = None
+
+        user = decode_user(user) if user else None
+        permission_mask = int(permission_mask) if permission_mask is not None else None
+
+        if self.local_cache:
+            self.local_cache.set(ident, user, permission_mask, generation)
+
+        return user, permission_mask, ttl
+
+
+    def get_principal_generation(
+        self,
+        ident: UUID
+    ) -> int | None:
+        if self.local_cache:
+            return self.local_cache.generation(ident)
+
+
+    async def set_principal(
+        self,
+        ident: UUID,
+        user: UserDTO | None = None,
+        permission_mask: int | None = None,
+        generation: int | None = None
+    ) -> None:
+        with observe_stage("redis_set"):
+            async with self.redis_engine.pipeline(transaction=False) as pipe:
+                if user is not None:
+                    pipe.set(f"user:{ident.hex}", encode_user(user), RedisConfig.CACHE_EXP())
+
+                if permission_mask is not None:
+                    pipe.set(f"permission-mask:{ident.hex}", str(permission_mask), RedisConfig.CACHE_EXP())
+
+                await pipe.execute()
+
+        if self.local_cache:
+            self.local_cache.set(ident, user, permission_mask, generation)
+
+
+    async def invalidate_principal(
+        self,
+        ident: UUID
+    ) -> None:
+        await self.invalidate_principals([ident])
+
+
+    async def invalidate_principals(
+        self,
+        idents: Iterable[UUID]
+    ) -> None:
+        idents = list(idents)
+
+        if not idents:
+            return
+
+        with observe_stage("redis_delete"):
+            async with self.redis_engine.pipeline(transaction=False) as pipe:
+                for ident in idents:
+                    pipe.delete(f"user:{ident.hex}", f"permission-mask:{ident.hex}")
+                    pipe.publish(RedisConfig.INVALIDATION_CHANNEL(), ident.hex)
+
+                await pipe.execute()
+
+        if self.local_cache:
+            for ident in idents:
+                self.local_cache.invalidate(ident)
 
 
     async def get_refresh_token(
         self,
         ident: UUID
-    ) -> PermissionDTO | None:
+    ) -> RefreshTokenDTO | None:
         res = await self._get(f"refresh-token:{ident.hex}")
 
         if res:
-            return RootModel[RefreshTokenDTO].model_validate_json(res).root
+            return decode_refresh_token(res)
 
 
     async def set_refresh_token(
         self,
         ident: UUID,
-        data: PermissionDTO
+        data: RefreshTokenDTO,
+        ttl: int | None = None
     ) -> None:
 
-        await self._set(
-            f"refresh-token:{ident.hex}", 
-            RootModel[RefreshTokenDTO](data).model_dump_json()
-        )
+        with observe_stage("redis_set"):
+            await self.redis_engine.set(
+                f"refresh-token:{ident.hex}", 
+                encode_refresh_token(data),
+                min(ttl, RedisConfig.CACHE_EXP()) if ttl is not None else RedisConfig.CACHE_EXP(),
+                nx=True
+            )
 
 
     async def delete_refresh_token(
         self,
         ident: UUID
     ) -> None:
-        await self._delete(f"refresh-token:{ident.hex}")
+        await self.delete_refresh_tokens([ident])
+
+
+    async def delete_refresh_tokens(
+        self,
+        idents: list[UUID]
+    ) -> None:
+        if idents:
+            with observe_stage("redis_delete"):
+                async with self.redis_engine.pipeline(transaction=False) as pipe:
+                    for ident in idents:
+                        pipe.set(f"refresh-token:{ident.hex}", REVOKED_REFRESH_TOKEN, RedisConfig.CACHE_EXP())
+
+                    await pipe.execute()
 
 
     async def _get(
         self,
         key: str
-    ) -> str | None:
-        return await self.redis_engine.get(key)
+    ) -> bytes | None:
+        with observe_stage("redis_get"):
+            return await self.redis_engine.get(key)
 
 
     async def _set(
         self,
         key: str,
-        data: str
+        data: str | bytes
     ) -> None:
-        await self.redis_engine.set(key, data, RedisConfig.CACHE_EXP())
+        with observe_stage("redis_set"):
+            await self.redis_engine.set(key, data, RedisConfig.CACHE_EXP())
 
 
     async def _delete(
         self,
         key: str
     ) -> None:
-        await self.redis_engine.delete(key)
+        with observe_stage("redis_delete"):
+            await self.redis_engine.delete(key)
@@ -0,0 +1,119 @@
+from math import ceil
+from time import monotonic
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.application.common.exc import LoginThrottled
+from app.utils.metrics import LOGIN_THROTTLE_REJECTIONS, LOGIN_THROTTLE_FALLBACKS
+from app.utils.ttl_cache import TTLCache
+
+
+TOKEN_BUCKET_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local retry_after = 0
+local buckets = {}
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local rate = tonumber(ARGV[i * 2])
+    local bucket = redis.call("HMGET", key, "tokens", "ts")
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+    if tokens < 1 then
+        retry_after = math.max(retry_after, math.ceil((1 - tokens) / rate))
+    end
+
+    buckets[i] = tokens
+end
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local rate = tonumber(ARGV[i * 2])
+    local tokens = buckets[i]
+
+    if retry_after == 0 then
+        tokens = tokens - 1
+    end
+
+    redis.call("HSET", key, "tokens", tostring(tokens), "ts", now)
+    redis.call("PEXPIRE", key, math.ceil(capacity / rate))
+end
+
+return retry_after
+"""
+
+
+class LoginThrottle:
+
+    def __init__(
+        self,
+        redis_engine: Redis,
+        login_capacity: int,
+        login_per_minute: int,
+        ip_capacity: int,
+        ip_per_minute: int,
+        fallback_size: int = 100000
+    ) -> None:
+        self.script = redis_engine.register_script(TOKEN_BUCKET_SCRIPT)
+        self.login_bucket = (login_capacity, login_per_minute / 60000)
+        self.ip_bucket = (ip_capacity, ip_per_minute / 60000)
+        self.fallback = TTLCache[str, tuple[float, float]](
+            maxsize=fallback_size,
+            ttl=max(
+                login_capacity / self.login_bucket[1] if login_per_minute else 0,
+                ip_capacity / self.ip_bucket[1] if ip_per_minute else 0
+            ) / 1000
+        )
+
+
+    async def __call__(self, login: str, client_ip: str | None) -> None:
+        buckets: dict[str, tuple[int, float]] = {}
+
+        if self.login_bucket[0] > 0 and self.login_bucket[1] > 0:
+            buckets[f"login-throttle:login:{login.lower()}"] = self.login_bucket
+
+        if client_ip and self.ip_bucket[0] > 0 and self.ip_bucket[1] > 0:
+            buckets[f"login-throttle:ip:{client_ip}"] = self.ip_bucket
+
+        if not buckets:
+            return
+
+        try:
+            retry_after = await self.script(
+                keys=list(buckets),
+                args=[arg for bucket in buckets.values() for arg in bucket]
+            )
+        except RedisError:
+            LOGIN_THROTTLE_FALLBACKS.inc()
+
+            retry_after = self._take_local(buckets)
+
+        if retry_after:
+            LOGIN_THROTTLE_REJECTIONS.inc()
+
+            raise LoginThrottled(retry_after=ceil(int(retry_after) / 1000))
+
+
+    def _take_local(self, buckets: dict[str, tuple[int, float]]) -> int:
+        now = monotonic() * 1000
+        retry_after = 0
+        tokens: dict[str, float] = {}
+
+        for key, (capacity, rate) in buckets.items():
+            current, ts = self.fallback.get(key) or (capacity, now)
+            current = min(capacity, current + max(0, now - ts) * rate)
+
+            if current < 1:
+                retry_after = max(retry_after, ceil((1 - current) / rate))
+
+            tokens[key] = current
+
+        for key, current in tokens.items():
+            self.fallback.set(key, (current if retry_after else current - 1, now))
+
+        return retry_after
@@ -1,2 +1,4 @@
-from app.infrastructure.services.hasher import PasswordHasher
-from app.infrastructure.services.jwt_service import JwtService
\ No newline at end of file
+from app.infrastructure.services.hasher import PasswordHasher, AsyncPasswordHasher
+from app.infrastructure.services.jwt_service import JwtService
+from app.infrastructure.services.route_matcher import RouteMatcher, load_route_matcher
+from app.infrastructure.services.token_pruner import RefreshTokenPruner
@@ -1,13 +1,111 @@
-from hashlib import sha256
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Callable
+from base64 import b64encode, b64decode
+from hashlib import sha256, scrypt
+from hmac import compare_digest
+import asyncio
+import os
 
 from app.application.interfaces.hasher import IPasswordHasher
+from app.utils.metrics import HASHER_QUEUE_DEPTH, HASHER_IN_FLIGHT, observe_stage
+from app.config import ApplicationConfig
+
+
+SCRYPT_PREFIX = "$scrypt$"
 
 
 class PasswordHasher(IPasswordHasher):
 
+    def __init__(
+        self,
+        log_n: int | None = None,
+        r: int | None = None,
+        p: int | None = None
+    ) -> None:
+        self.log_n = log_n or ApplicationConfig.SCRYPT_LOG_N()
+        self.r = r or ApplicationConfig.SCRYPT_R()
+        self.p = p or ApplicationConfig.SCRYPT_P()
+
+
     def hash(self, password: str) -> str:
-        return sha256(password.encode()).hexdigest()
+        salt = os.urandom(16)
+
+        with observe_stage("hash"):
+            digest = self._scrypt(password, salt, self.log_n, self.r, self.p)
+
+        return f"{SCRYPT_PREFIX}ln={self.log_n},r={self.r},p={self.p}${self._b64(salt)}${self._b64(digest)}"
     
 
     def verify(self, password: str, hashed_password: str) -> bool:
-        return sha256(password.encode()).hexdigest() == hashed_password
+        with observe_stage("hash_verify"):
+            if hashed_password.startswith(SCRYPT_PREFIX):
+                log_n, r, p, salt, digest = self._parse_scrypt(hashed_password)
+
+                return compare_digest(self._scrypt(password, salt, log_n, r, p), digest)
+
+            return compare_digest(sha256(password.encode()).hexdigest(), hashed_password)
+    
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        if not hashed_password.startswith(SCRYPT_PREFIX):
+            return True
+        
+        log_n, r, p, _, _ = self._parse_scrypt(hashed_password)
+
+        return (log_n, r, p) != (self.log_n, self.r, self.p)
+    
+
+    def _scrypt(self, password: str, salt: bytes, log_n: int, r: int, p: int) -> bytes:
+        return scrypt(password.encode(), salt=salt, n=1 << log_n, r=r, p=p, maxmem=256 * r * (1 << log_n), dklen=32)
+    
+
+    def _parse_scrypt(self, hashed_password: str) -> tuple[int, int, int, bytes, bytes]:
+        params, salt, digest = hashed_password.removeprefix(SCRYPT_PREFIX).split("$")
+        params = dict(param.split("=") for param in params.split(","))
+
+        return int(params["ln"]), int(params["r"]), int(params["p"]), b64decode(salt + "=="), b64decode(digest + "==")
+    
+
+    def _b64(self, data: bytes) -> str:
+        return b64encode(data).decode().rstrip("=")
+
+
+class AsyncPasswordHasher:
+
+    def __init__(self, hasher: PasswordHasher, max_workers: int) -> None:
+        self.hasher = hasher
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+        self.semaphore = asyncio.Semaphore(max_workers)
+
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.hasher.hash, password)
+    
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.hasher.verify, password, hashed_password)
+    
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return self.hasher.needs_rehash(hashed_password)
+    
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+    
+
+    async def _run[T](self, func: Callable[..., T], *args) -> T:
+        HASHER_QUEUE_DEPTH.inc()
+
+        try:
+            await self.semaphore.acquire()
+        finally:
+            HASHER_QUEUE_DEPTH.dec()
+
+        HASHER_IN_FLIGHT.inc()
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            HASHER_IN_FLIGHT.dec()
+            self.semaphore.release()
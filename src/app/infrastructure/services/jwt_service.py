@@ -1,17 +1,39 @@
-from typing import Any, TypedDict, Unpack
-from uuid import UUID
+from typing import Any, TypedDict, NotRequired, Unpack
+from uuid import UUID, uuid4
 from datetime import datetime
+from time import time
+from hashlib import sha256
+from base64 import urlsafe_b64encode
 from copy import copy
+import json
 
-from jose.jwt import encode as jwt_encode, decode as jwt_decode
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWTError, JWTClaimsError, ExpiredSignatureError
+from jose.jwt import encode as jwt_encode, decode as jwt_decode, get_unverified_header
 
+from app.application.dto import PermissionClaims
+from app.utils.ttl_cache import TTLCache
+from app.utils.metrics import TOKEN_CACHE_REQUESTS, observe_stage
 from app.config import ApplicationConfig
 
 
+TOKEN_FORMAT_VERSION = 2
+LEGACY_DATETIME_FORMAT = "%d.%m.%Y %H:%M:%S.%f"
+
+
+def jwk_thumbprint(data: dict[str, str]) -> str:
+    required = {"RSA": ("e", "kty", "n"), "EC": ("crv", "kty", "x", "y")}[data["kty"]]
+    canonical = json.dumps({key: data[key] for key in required}, separators=(",", ":"), sort_keys=True)
+
+    return urlsafe_b64encode(sha256(canonical.encode()).digest()).rstrip(b"=").decode()
+
+
 class AccessTokenPayload(TypedDict):
     user_ident: UUID
     gen_dt: datetime
     exp_dt: datetime
+    permissions: NotRequired[PermissionClaims | None]
 
 
 class RefreshTokenPayload(TypedDict):
@@ -25,6 +47,20 @@ class JwtService:
     def __init__(self) -> None:
         self.algorithm = ApplicationConfig.ALGORITHM()
         self.secret_key = ApplicationConfig.SECRET_KEY()
+        self.accept_legacy_hs256 = ApplicationConfig.JWT_ACCEPT_LEGACY_HS256()
+
+        self.kid: str | None = None
+        self.signing_key: Key | str = self.secret_key
+        self.verification_keys: dict[str, Key] = {}
+        self.jwks: list[dict[str, str]] = []
+
+        self.cache: TTLCache[bytes, dict[str, Any]] = TTLCache(
+            maxsize=ApplicationConfig.TOKEN_CACHE_SIZE(),
+            ttl=ApplicationConfig.TOKEN_CACHE_TTL()
+        )
+
+        if not self.algorithm.startswith("HS"):
+            self._load_keys()
 
     
     def encode(
@@ -34,13 +70,15 @@ class JwtService:
         
         payload = copy(payload)
 
-        payload["gen_dt"] = payload.pop("gen_dt").strftime("%d.%m.%Y %H:%M:%S.%f")
-        payload["exp_dt"] = payload.pop("exp_dt").strftime("%d.%m.%Y %H:%M:%S.%f")
+        payload["v"] = TOKEN_FORMAT_VERSION
+        payload["iat"] = int(payload.pop("gen_dt").timestamp())
+        payload["exp"] = int(payload.pop("exp_dt").timestamp())
 
         return jwt_encode(
             payload,
-            self.secret_key,
-            self.algorithm
+            self.signing_key,
+            self.algorithm,
+            headers={"kid": self.kid} if self.kid else None
         )
     
 
@@ -48,11 +86,24 @@ class JwtService:
         self,
         token: str
     ) -> dict[str, Any]:
-        return jwt_decode(
-            token,
-            self.secret_key,
-            self.algorithm
-        )
+        key = sha256(token.encode()).digest()
+        data = self.cache.get(key)
+
+        if data is not None:
+            TOKEN_CACHE_REQUESTS.labels(result="hit").inc()
+            return data
+        
+        TOKEN_CACHE_REQUESTS.labels(result="miss").inc()
+
+        with observe_stage("jwt_decode"):
+            data = self._verify(token)
+
+            if "v" not in data:
+                data = self._upgrade_legacy_payload(data)
+
+        self.cache.set(key, data, data["exp"])
+
+        return data
     
 
     def create_access_token(
@@ -61,6 +112,15 @@ class JwtService:
     ) -> str:
         
         payload["user_ident"] = payload["user_ident"].hex
+        payload["jti"] = uuid4().hex
+
+        permissions = payload.pop("permissions", None)
+
+        if permissions:
+            payload["prm"] = {
+                "pm": permissions.mask,
+                "prj": permissions.projects
+            }
         
         return self.encode(
             payload=payload
@@ -87,8 +147,9 @@ class JwtService:
 
         return AccessTokenPayload(
             user_ident=data["user_ident"],
-            gen_dt=datetime.strptime(data["gen_dt"], "%d.%m.%Y %H:%M:%S.%f"),
-            exp_dt=datetime.strptime(data["exp_dt"], "%d.%m.%Y %H:%M:%S.%f"),
+            gen_dt=datetime.fromtimestamp(data["iat"]),
+            exp_dt=datetime.fromtimestamp(data["exp"]),
+            permissions=self._read_permission_claims(data.get("prm"))
         )
     
 
@@ -99,8 +160,95 @@ class JwtService:
         data = self.decode(token)
 
         return RefreshTokenPayload(
-            ident=data["ident"],
-            user_ident=data["user_ident"],
-            gen_dt=datetime.strptime(data["gen_dt"], "%d.%m.%Y %H:%M:%S.%f"),
-            exp_dt=datetime.strptime(data["exp_dt"], "%d.%m.%Y %H:%M:%S.%f"),
+            ident=UUID(data["ident"]),
+            user_ident=UUID(data["user_ident"]),
+            gen_dt=datetime.fromtimestamp(data["iat"]),
+            exp_dt=datetime.fromtimestamp(data["exp"]),
         )
+    
+
+    def _verify(
+        self,
+        token: str
+    ) -> dict[str, Any]:
+        if not self.kid:
+            return jwt_decode(
+                token,
+                self.secret_key,
+                self.algorithm
+            )
+        
+        kid = get_unverified_header(token).get("kid")
+
+        if kid is None and self.accept_legacy_hs256 and self.secret_key:
+            return jwt_decode(
+                token,
+                self.secret_key,
+                "HS256"
+            )
+
+        key = self.verification_keys.get(kid)
+
+        if key is None:
+            raise JWTError(f"unknown key id ({kid})")
+
+        return jwt_decode(
+            token,
+            key,
+            self.algorithm
+        )
+    
+
+    def _upgrade_legacy_payload(
+        self,
+        data: dict[str, Any]
+    ) -> dict[str, Any]:
+        if not ApplicationConfig.LEGACY_TOKEN_FORMAT_ACCEPTED():
+            raise JWTClaimsError("legacy token format is not accepted")
+        
+        data["iat"] = datetime.strptime(data.pop("gen_dt"), LEGACY_DATETIME_FORMAT).timestamp()
+        data["exp"] = datetime.strptime(data.pop("exp_dt"), LEGACY_DATETIME_FORMAT).timestamp()
+
+        if data["exp"] < time():
+            raise ExpiredSignatureError("Signature has expired.")
+        
+        return data
+    
+
+    def _read_permission_claims(
+        self,
+        data: dict[str, Any] | None
+    ) -> PermissionClaims | None:
+        if data is None:
+            return None
+
+        return PermissionClaims(
+            projects=data["prj"],
+            mask=data["pm"]
+        )
+    
+
+    def _load_keys(self) -> None:
+        private_key_path = ApplicationConfig.JWT_PRIVATE_KEY_PATH()
+
+        if private_key_path is None:
+            raise ValueError(f"JWT_PRIVATE_KEY_PATH must be set for asymmetric algorithm ({self.algorithm})")
+
+        private_key = jwk.construct(private_key_path.read_text(), self.algorithm)
+
+        public_keys = [private_key.public_key()] + [
+            jwk.construct(path.read_text(), self.algorithm) for path in ApplicationConfig.JWT_PREVIOUS_PUBLIC_KEY_PATHS()
+        ]
+
+        for public_key in public_keys:
+            data = public_key.to_dict()
+            kid = jwk_thumbprint(data)
+
+            if kid in self.verification_keys:
+                continue
+
+            self.verification_keys[kid] = public_key
+            self.jwks.append({**data, "kid": kid, "use": "sig"})
+
+        self.signing_key = private_key
+        self.kid = self.jwks[0]["kid"]
@@ -0,0 +1,99 @@
+from typing import Any
+from pathlib import Path
+import json
+
+
+class RouteNode:
+    __slots__ = ("children", "param", "tail", "methods")
+
+    def __init__(self) -> None:
+        self.children: dict[str, RouteNode] = {}
+        self.param: RouteNode | None = None
+        self.tail: dict[str, Any] | None = None
+        self.methods: dict[str, Any] | None = None
+
+
+class RouteMatcher:
+
+    def __init__(self, rules: dict[str, dict[str, Any]]) -> None:
+        self.root = RouteNode()
+
+        for pattern, methods in rules.items():
+            self.add(pattern, methods)
+
+
+    def add(self, pattern: str, methods: dict[str, Any]) -> None:
+        node = self.root
+        segments = self._split(pattern)
+
+        for i, segment in enumerate(segments):
+            if segment == "**":
+                if i != len(segments) - 1:
+                    raise ValueError(f"'**' must be the last segment of route pattern ({pattern})")
+
+                node.tail = (node.tail or {}) | self._normalize_methods(methods)
+                return
+
+            if segment == "*" or (segment.startswith("{") and segment.endswith("}")):
+                node.param = node.param or RouteNode()
+                node = node.param
+            else:
+                node = node.children.setdefault(segment, RouteNode())
+
+        node.methods = (node.methods or {}) | self._normalize_methods(methods)
+
+
+    def match(self, method: str, uri: str) -> Any | None:
+        return self._match(self.root, self._split(uri.split("?", 1)[0]), 0, method.upper())
+
+
+    def _match(self, node: RouteNode, segments: list[str], i: int, method: str) -> Any | None:
+        if i == len(segments):
+            if node.methods:
+                res = node.methods.get(method, node.methods.get("*"))
+
+                if res is not None:
+                    return res
+        else:
+            child = node.children.get(segments[i])
+
+            if child:
+                res = self._match(child, segments, i + 1, method)
+
+                if res is not None:
+                    return res
+
+            if node.param:
+                res = self._match(node.param, segments, i + 1, method)
+
+                if res is not None:
+                    return res
+
+        if node.tail:
+            return node.tail.get(method, node.tail.get("*"))
+
+        return None
+
+
+    def _split(self, path: str) -> list[str]:
+        return [segment for segment in path.split("/") if segment]
+
+
+    def _normalize_methods(self, methods: dict[str, Any]) -> dict[str, Any]:
+        return {method.upper(): key for method, key in methods.items()}
+
+
+def load_route_matcher(path: Path, permission_bits: dict[str, int]) -> RouteMatcher:
+    rules: dict[str, dict[str, str]] = json.loads(path.read_text(encoding="utf-8"))
+    compiled: dict[str, dict[str, int]] = {}
+
+    for pattern, methods in rules.items():
+        compiled[pattern] = {}
+
+        for method, key in methods.items():
+            if key not in permission_bits:
+                raise ValueError(f"unknown permission ({key}) for route ({method} {pattern})")
+            
+            compiled[pattern][method] = permission_bits[key]
+
+    return RouteMatcher(compiled)
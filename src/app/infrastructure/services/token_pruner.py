@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+from time import perf_counter
+import logging
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from redis.asyncio import Redis
+from redis.exceptions import LockError
+
+from app.infrastructure.database.mappers import RefreshTokenMapper
+from app.utils.metrics import REFRESH_TOKENS_PRUNED, REFRESH_TOKEN_PRUNE_RUNS, REFRESH_TOKEN_PRUNE_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshTokenPruner:
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        redis_engine: Redis,
+        retention: timedelta,
+        batch_size: int,
+        lock_timeout: float = 600
+    ) -> None:
+        self.session_maker = session_maker
+        self.redis_engine = redis_engine
+        self.retention = retention
+        self.batch_size = batch_size
+        self.lock_timeout = lock_timeout
+
+
+    async def prune(self) -> int | None:
+        lock = self.redis_engine.lock("refresh-token-prune-lock", timeout=self.lock_timeout, blocking=False)
+
+        if not await lock.acquire():
+            REFRESH_TOKEN_PRUNE_RUNS.labels(result="skipped").inc()
+            return None
+
+        start = batch_start = perf_counter()
+        before = datetime.now() - self.retention
+        slowest_batch = 0.0
+        total = 0
+
+        try:
+            while True:
+                async with self.session_maker() as session:
+                    deleted = await RefreshTokenMapper(session).delete_expired(before, self.batch_size)
+
+                    await session.commit()
+
+                total += deleted
+                REFRESH_TOKENS_PRUNED.inc(deleted)
+
+                now = perf_counter()
+                slowest_batch = max(slowest_batch, now - batch_start)
+                batch_start = now
+
+                if deleted < self.batch_size:
+                    break
+
+                if self.lock_timeout - (now - start) < 2 * slowest_batch:
+                    logger.info("refresh token prune stopped after %s tokens to stay within the lock timeout", total)
+                    break
+
+                await asyncio.sleep(0)
+        finally:
+            try:
+                await lock.release()
+            except LockError:
+                logger.warning("refresh token prune lock expired before release")
+
+        REFRESH_TOKEN_PRUNE_SECONDS.observe(perf_counter() - start)
+        REFRESH_TOKEN_PRUNE_RUNS.labels(result="completed").inc()
+
+        return total
+
+
+    async def run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.prune()
+            except Exception:
+                REFRESH_TOKEN_PRUNE_RUNS.labels(result="failed").inc()
+                logger.exception("refresh token prune run failed")
+
+            await asyncio.sleep(interval)
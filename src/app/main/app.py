@@ -1,7 +1,18 @@
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import os
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from dishka.integrations.fastapi import setup_dishka
+from prometheus_client import multiprocess
+
+import redis.asyncio as redis
 
 from app.main.dependencies.ioc_container import container
+from app.infrastructure.redis.local_cache import PrincipalCache
+from app.infrastructure.services import RefreshTokenPruner
+from app.config import RedisConfig, ApplicationConfig
 from app.application.common.exc import (
     AccessForbidden, 
     UserNotFound, 
@@ -12,13 +23,17 @@ from app.application.common.exc import (
     InvalidRefreshToken,
     RefreshTokenRevoked,
     RefreshTokenExpired,
+    AccessTokenExpired,
     InvalidAccessToken,
     PermissionDataNotFound,
     OriginalMethodNotFound,
-    OriginalUriNotFound
+    OriginalUriNotFound,
+    LoginThrottled
 )
 from app.presentation.routes.user import user_router
 from app.presentation.routes.auth import auth_router
+from app.presentation.routes.metrics import metrics_router
+from app.presentation.middlewares import MetricsMiddleware
 from app.presentation.routes.exc_handler import (
     user_not_found_handler,
     access_forbidden_handler,
@@ -29,13 +44,52 @@ from app.presentation.routes.exc_handler import (
     invalid_refresh_token_handler,
     refresh_token_revoked_handler,
     refresh_token_expired_handler,
+    access_token_expired_handler,
     invalid_access_token_handler,
     permission_data_not_found_handler,
     original_method_not_found_handler,
-    original_uri_not_found_handler
+    original_uri_not_found_handler,
+    login_throttled_handler
 )
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    local_cache = await container.get(PrincipalCache)
+    redis_engine = await container.get(redis.Redis)
+
+    background_tasks = [
+        asyncio.create_task(
+            local_cache.listen(redis_engine, RedisConfig.INVALIDATION_CHANNEL())
+        )
+    ]
+
+    if ApplicationConfig.REFRESH_TOKEN_PRUNE_INTERVAL() > 0:
+        refresh_token_pruner = await container.get(RefreshTokenPruner)
+
+        background_tasks.append(
+            asyncio.create_task(
+                refresh_token_pruner.run(ApplicationConfig.REFRESH_TOKEN_PRUNE_INTERVAL())
+            )
+        )
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+
+        with suppress(asyncio.CancelledError):
+            await task
+
+    await container.close()
+
+    multiproc_dir = ApplicationConfig.PROMETHEUS_MULTIPROC_DIR()
+
+    if multiproc_dir:
+        multiprocess.mark_process_dead(os.getpid(), str(multiproc_dir))
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 setup_dishka(container=container, app=app)
 
@@ -48,10 +102,15 @@ app.add_exception_handler(InvalidPassword, invalid_password_handler)
 app.add_exception_handler(InvalidRefreshToken, invalid_refresh_token_handler)
 app.add_exception_handler(RefreshTokenRevoked, refresh_token_revoked_handler)
 app.add_exception_handler(RefreshTokenExpired, refresh_token_expired_handler)
+app.add_exception_handler(AccessTokenExpired, access_token_expired_handler)
 app.add_exception_handler(InvalidAccessToken, invalid_access_token_handler)
 app.add_exception_handler(PermissionDataNotFound, permission_data_not_found_handler)
 app.add_exception_handler(OriginalMethodNotFound, original_method_not_found_handler)
 app.add_exception_handler(OriginalUriNotFound, original_uri_not_found_handler)
+app.add_exception_handler(LoginThrottled, login_throttled_handler)
 
 app.include_router(user_router)
 app.include_router(auth_router)
+app.include_router(metrics_router)
+
+app.add_middleware(MetricsMiddleware)
@@ -1,15 +1,21 @@
+from typing import Iterator
+
 from dishka import Provider, Scope, provide, from_context
 from naks_library.committer import SqlAlchemyCommitter
-from jose.exceptions import JWTError, JWTClaimsError
+from jose.exceptions import JWTError, JWTClaimsError, ExpiredSignatureError
 from fastapi import Request
 
 import redis.asyncio as redis
 
 from app.application.interfaces.gateways import UserGateway, RefreshTokenGateway, PermissionGateway, RedisGateway
 from app.application.dto import RefreshTokenDTO, CurrentUser
+from app.application.common.permissions import PERMISSION_BITS
 from app.application.interactors import (
     CreateUserInteractor, 
     GetUserInteractor, 
+    GetUsersInteractor,
+    ListUsersInteractor,
+    StreamUsersInteractor,
     UpdateUserInteractor, 
     DeleteUserInteractor,
     GetRefreshTokenInteractor, 
@@ -18,6 +24,7 @@ from app.application.interactors import (
     UpdateUserTokensInteractor,
     LogoutUserInteractor,
     ValidateAccessInteractor,
+    ValidateAccessBatchInteractor,
     GetUserPermissionsInteractor,
 )
 from app.application.common.exc import (
@@ -26,12 +33,17 @@ from app.application.common.exc import (
     RefreshTokenNotFound,
     InvalidRefreshToken,
     InvalidAccessToken, 
+    RefreshTokenExpired,
+    AccessTokenExpired,
     UserNotFound
 )
-from app.infrastructure.services import PasswordHasher, JwtService
+from app.infrastructure.services import PasswordHasher, AsyncPasswordHasher, JwtService, RouteMatcher, load_route_matcher
 from app.infrastructure.database.mappers import UserMapper, RefreshTokenMapper, PermissionMapper
 from app.infrastructure.redis.redis_mapper import RedisMapper
+from app.infrastructure.redis.local_cache import PrincipalCache
+from app.infrastructure.redis.throttle import LoginThrottle
 from app.infrastructure.dto import AccessTokenDTO
+from app.config import ApplicationConfig
 
 
 class ApplicationProvider(Provider):
@@ -42,11 +54,36 @@ class ApplicationProvider(Provider):
         return PasswordHasher()
 
 
+    @provide(scope=Scope.APP)
+    def get_async_hasher(self, hasher: PasswordHasher) -> Iterator[AsyncPasswordHasher]:
+        async_hasher = AsyncPasswordHasher(hasher, ApplicationConfig.HASHER_MAX_WORKERS())
+
+        yield async_hasher
+
+        async_hasher.shutdown()
+
+
+    @provide(scope=Scope.APP)
+    def get_login_throttle(self, redis: redis.Redis) -> LoginThrottle:
+        return LoginThrottle(
+            redis,
+            login_capacity=ApplicationConfig.LOGIN_THROTTLE_LOGIN_CAPACITY(),
+            login_per_minute=ApplicationConfig.LOGIN_THROTTLE_LOGIN_PER_MINUTE(),
+            ip_capacity=ApplicationConfig.LOGIN_THROTTLE_IP_CAPACITY(),
+            ip_per_minute=ApplicationConfig.LOGIN_THROTTLE_IP_PER_MINUTE()
+        )
+
+
     @provide(scope=Scope.APP)
     def get_jwt_service(self) -> JwtService:
         return JwtService()
 
 
+    @provide(scope=Scope.APP)
+    def get_route_matcher(self) -> RouteMatcher:
+        return load_route_matcher(ApplicationConfig.ACCESS_RULES_PATH(), PERMISSION_BITS)
+
+
     @provide(scope=Scope.REQUEST)
     async def get_refresh_token(
         self,
@@ -59,6 +96,8 @@ class ApplicationProvider(Provider):
         if refresh_token_cookie:
             try:
                 refresh_token_payload = jwt_service.read_refresh_token(refresh_token_cookie)
+            except ExpiredSignatureError:
+                raise RefreshTokenExpired
             except (JWTError, JWTClaimsError):
                 raise InvalidRefreshToken
             
@@ -85,6 +124,8 @@ class ApplicationProvider(Provider):
         if access_token_cookie:
             try:
                 access_token_payload = jwt_service.read_access_token(access_token_cookie)
+            except ExpiredSignatureError:
+                raise AccessTokenExpired
             except (JWTError, JWTClaimsError):
                 raise InvalidAccessToken
 
@@ -92,7 +133,8 @@ class ApplicationProvider(Provider):
                 token=access_token_cookie,
                 user_ident=access_token_payload["user_ident"],
                 gen_dt=access_token_payload["gen_dt"],
-                exp_dt=access_token_payload["exp_dt"]
+                exp_dt=access_token_payload["exp_dt"],
+                permissions=access_token_payload["permissions"]
             )
         
         raise AccessTokenCookieNotFound
@@ -143,44 +185,92 @@ class ApplicationProvider(Provider):
     async def get_redis_gateway(
         self,
         redis: redis.Redis,
+        local_cache: PrincipalCache
     ) -> RedisGateway:
-        return RedisMapper(redis)
+        return RedisMapper(redis, local_cache)
 
 
     @provide(scope=Scope.REQUEST)
     async def get_create_user_interactor(
         self, 
         committer: SqlAlchemyCommitter,
-        user_gateway: UserGateway
+        user_gateway: UserGateway,
+        hasher: AsyncPasswordHasher
     ) -> CreateUserInteractor:
 
         return CreateUserInteractor(
             gateway=user_gateway,
-            committer=committer
+            committer=committer,
+            hasher=hasher
         )
 
 
     @provide(scope=Scope.REQUEST)
     async def get_user_data_interactor(
         self, 
+        committer: SqlAlchemyCommitter,
         user_gateway: UserGateway
     ) -> GetUserInteractor:
 
         return GetUserInteractor(
-            gateway=user_gateway
+            gateway=user_gateway,
+            committer=committer
         )
 
 
     @provide(scope=Scope.REQUEST)
-    async def get_update_user_interactor(
+    async def get_users_data_interactor(
+        self, 
+        committer: SqlAlchemyCommitter,
+        user_gateway: UserGateway
+    ) -> GetUsersInteractor:
+
+        return GetUsersInteractor(
+            gateway=user_gateway,
+            committer=committer
+        )
+
+
+    @provide(scope=Scope.REQUEST)
+    async def get_list_users_interactor(
         self, 
         committer: SqlAlchemyCommitter,
         user_gateway: UserGateway
+    ) -> ListUsersInteractor:
+
+        return ListUsersInteractor(
+            gateway=user_gateway,
+            committer=committer
+        )
+
+
+    @provide(scope=Scope.REQUEST)
+    async def get_stream_users_interactor(
+        self, 
+        committer: SqlAlchemyCommitter,
+        user_gateway: UserGateway
+    ) -> StreamUsersInteractor:
+
+        return StreamUsersInteractor(
+            gateway=user_gateway,
+            committer=committer
+        )
+
+
+    @provide(scope=Scope.REQUEST)
+    async def get_update_user_interactor(
+        self, 
+        committer: SqlAlchemyCommitter,
+        user_gateway: UserGateway,
+        redis_gateway: RedisGateway,
+        hasher: AsyncPasswordHasher
     ) -> UpdateUserInteractor:
 
         return UpdateUserInteractor(
             gateway=user_gateway,
-            committer=committer
+            committer=committer,
+            redis_gateway=redis_gateway,
+            hasher=hasher
         )
 
 
@@ -188,23 +278,27 @@ class ApplicationProvider(Provider):
     async def get_delete_user_interactor(
         self, 
         committer: SqlAlchemyCommitter,
-        user_gateway: UserGateway
+        user_gateway: UserGateway,
+        redis_gateway: RedisGateway
     ) -> DeleteUserInteractor:
 
         return DeleteUserInteractor(
             gateway=user_gateway,
-            committer=committer
+            committer=committer,
+            redis_gateway=redis_gateway
         )
 
 
     @provide(scope=Scope.REQUEST)
     async def get_refresh_token_data_interactor(
         self, 
-        refresh_token_gateway: RefreshTokenGateway
+        refresh_token_gateway: RefreshTokenGateway,
+        redis_gateway: RedisGateway
     ) -> GetRefreshTokenInteractor:
 
         return GetRefreshTokenInteractor(
-            gateway=refresh_token_gateway
+            gateway=refresh_token_gateway,
+            redis_gateway=redis_gateway
         )
     
     
@@ -214,13 +308,19 @@ class ApplicationProvider(Provider):
         user_gateway: UserGateway,
         refresh_token_gateway: RefreshTokenGateway,
         committer: SqlAlchemyCommitter,
-        jwt_service: JwtService
+        jwt_service: JwtService,
+        hasher: AsyncPasswordHasher,
+        throttle: LoginThrottle,
+        redis_gateway: RedisGateway
     ) -> LoginUserInteractor:
         return LoginUserInteractor(
             user_gateway=user_gateway,
             refresh_token_gateway=refresh_token_gateway,
             committer=committer,
-            jwt_service=jwt_service
+            jwt_service=jwt_service,
+            hasher=hasher,
+            throttle=throttle,
+            redis_gateway=redis_gateway
         )
     
     
@@ -230,13 +330,15 @@ class ApplicationProvider(Provider):
         user_gateway: UserGateway,
         refresh_token_gateway: RefreshTokenGateway,
         committer: SqlAlchemyCommitter,
-        jwt_service: JwtService
+        jwt_service: JwtService,
+        redis_gateway: RedisGateway
     ) -> AuthenticateUserInteractor:
         return AuthenticateUserInteractor(
             user_gateway=user_gateway,
             refresh_token_gateway=refresh_token_gateway,
             committer=committer,
-            jwt_service=jwt_service
+            jwt_service=jwt_service,
+            redis_gateway=redis_gateway
         )
     
     
@@ -246,13 +348,15 @@ class ApplicationProvider(Provider):
         user_gateway: UserGateway,
         refresh_token_gateway: RefreshTokenGateway,
         committer: SqlAlchemyCommitter,
-        jwt_service: JwtService
+        jwt_service: JwtService,
+        redis_gateway: RedisGateway
     ) -> UpdateUserTokensInteractor:
         return UpdateUserTokensInteractor(
             user_gateway=user_gateway,
             refresh_token_gateway=refresh_token_gateway,
             committer=committer,
-            jwt_service=jwt_service
+            jwt_service=jwt_service,
+            redis_gateway=redis_gateway
         )
     
     
@@ -260,11 +364,13 @@ class ApplicationProvider(Provider):
     async def get_logout_user_interactor(
         self,
         refresh_token_gateway: RefreshTokenGateway,
-        committer: SqlAlchemyCommitter
+        committer: SqlAlchemyCommitter,
+        redis_gateway: RedisGateway
     ) -> LogoutUserInteractor:
         return LogoutUserInteractor(
             refresh_token_gateway=refresh_token_gateway,
-            committer=committer
+            committer=committer,
+            redis_gateway=redis_gateway
         )
     
     
@@ -273,20 +379,44 @@ class ApplicationProvider(Provider):
         self,
         user_gateway: UserGateway,
         permission_gateway: PermissionGateway,
-        redis_gateway: RedisGateway
+        redis_gateway: RedisGateway,
+        route_matcher: RouteMatcher,
+        committer: SqlAlchemyCommitter
     ) -> ValidateAccessInteractor:
         return ValidateAccessInteractor(
             user_gateway=user_gateway,
             permission_gateway=permission_gateway,
-            redis_gateway=redis_gateway
+            redis_gateway=redis_gateway,
+            route_matcher=route_matcher,
+            committer=committer
+        )
+    
+    
+    @provide(scope=Scope.REQUEST)
+    async def provide_validate_access_batch_interactor(
+        self,
+        user_gateway: UserGateway,
+        permission_gateway: PermissionGateway,
+        redis_gateway: RedisGateway,
+        route_matcher: RouteMatcher,
+        committer: SqlAlchemyCommitter
+    ) -> ValidateAccessBatchInteractor:
+        return ValidateAccessBatchInteractor(
+            user_gateway=user_gateway,
+            permission_gateway=permission_gateway,
+            redis_gateway=redis_gateway,
+            route_matcher=route_matcher,
+            committer=committer
         )
     
     
     @provide(scope=Scope.REQUEST)
     async def provide_user_permissions(
         self,
-        permission_gateway: PermissionGateway
+        permission_gateway: PermissionGateway,
+        committer: SqlAlchemyCommitter
     ) -> GetUserPermissionsInteractor:
         return GetUserPermissionsInteractor(
-            permission_gateway=permission_gateway
+            permission_gateway=permission_gateway,
+            committer=committer
         )
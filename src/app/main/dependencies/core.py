@@ -1,4 +1,5 @@
 from typing import AsyncIterator
+from datetime import timedelta
 
 from dishka import Provider, Scope, provide
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
@@ -8,6 +9,9 @@ import redis.asyncio as redis
 
 from app.infrastructure.database.setup import create_engine, create_session_maker
 from app.infrastructure.redis.setup import create_redis
+from app.infrastructure.redis.local_cache import PrincipalCache
+from app.infrastructure.services.token_pruner import RefreshTokenPruner
+from app.config import RedisConfig, ApplicationConfig
 
 
 class CoreProvider(Provider):
@@ -36,3 +40,25 @@ class CoreProvider(Provider):
     ) -> AsyncIterator[redis.Redis]:
         async with create_redis() as redis:
             yield redis
+
+
+    @provide(scope=Scope.APP)
+    def provide_principal_cache(self) -> PrincipalCache:
+        return PrincipalCache(
+            maxsize=RedisConfig.LOCAL_CACHE_SIZE(),
+            ttl=RedisConfig.LOCAL_CACHE_TTL()
+        )
+
+
+    @provide(scope=Scope.APP)
+    def provide_refresh_token_pruner(
+        self,
+        session_pool: async_sessionmaker[AsyncSession],
+        redis: redis.Redis
+    ) -> RefreshTokenPruner:
+        return RefreshTokenPruner(
+            session_maker=session_pool,
+            redis_engine=redis,
+            retention=timedelta(hours=ApplicationConfig.REFRESH_TOKEN_RETENTION_HOURS()),
+            batch_size=ApplicationConfig.REFRESH_TOKEN_PRUNE_BATCH_SIZE()
+        )
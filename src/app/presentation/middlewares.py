@@ -0,0 +1,38 @@
+from time import perf_counter
+
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from app.utils.metrics import REQUEST_SECONDS
+
+
+class MetricsMiddleware:
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        start = perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+
+            REQUEST_SECONDS.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status)
+            ).observe(perf_counter() - start)
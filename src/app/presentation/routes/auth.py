@@ -1,37 +1,87 @@
 from datetime import timezone
+from ipaddress import ip_address
 
 from fastapi import APIRouter, Response, Request
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
 
-from app.presentation.shemas import UserWithouPasswordShema
+from app.presentation.shemas import UserWithouPasswordShema, ValidateAccessBatchShema, ValidateAccessBatchResultShema
 from app.infrastructure.dto import LoginData, AccessTokenDTO
-from app.application.dto import RefreshTokenDTO, CurrentUser, PermissionDTO
+from app.application.dto import RefreshTokenDTO, CurrentUser, PermissionDTO, PermissionClaims
 from app.application.interactors import (
     LoginUserInteractor,
     AuthenticateUserInteractor,
     UpdateUserTokensInteractor,
     LogoutUserInteractor,
     ValidateAccessInteractor,
+    ValidateAccessBatchInteractor,
     GetUserPermissionsInteractor,
 )
 from app.application.common.exc import PermissionDataNotFound
+from app.infrastructure.services import JwtService
 from app.config import ApplicationConfig
 
 
+PERMISSION_ADAPTER = TypeAdapter(PermissionDTO)
+ME_FIELDS = set(UserWithouPasswordShema.model_fields)
+
+
 auth_router = APIRouter(
     prefix="/auth/v1",
     route_class=DishkaRoute
 )
 
 
+def get_projects_header(claims: PermissionClaims) -> str | None:
+    if claims.is_super_user:
+        return "all"
+    
+    if claims.projects:
+        return " | ".join(claims.projects)
+
+
+def is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ip_address(host)
+    except ValueError:
+        return False
+
+    return any(address in network for network in ApplicationConfig.TRUSTED_PROXIES())
+
+
+def get_client_ip(request: Request) -> str | None:
+    if request.client is None:
+        return None
+
+    host = request.client.host
+
+    if not is_trusted_proxy(host):
+        return host
+
+    for forwarded in reversed(request.headers.get("x-forwarded-for", "").split(",")):
+        forwarded = forwarded.strip()
+
+        if not forwarded:
+            continue
+
+        host = forwarded
+
+        if not is_trusted_proxy(host):
+            break
+
+    return host
+
+
 @auth_router.post("/login")
 async def login(
     login_action: FromDishka[LoginUserInteractor],
-    data: LoginData
+    data: LoginData,
+    request: Request
 ) -> Response: 
     
-    refresh_token, access_token = await login_action(data)
+    refresh_token, access_token = await login_action(data, get_client_ip(request))
 
     response = Response()
 
@@ -95,34 +145,67 @@ async def validate_data_access(
     request: Request
 ) -> Response:
     
-    user, permissions = await validate_access_action(
+    claims = await validate_access_action(
         access_token=access_token, 
         request=request
     )
     
     response = Response()
 
-    if permissions.is_super_user:
-        response.headers["X-User-Projects"] = "all"
-    elif user.projects:
-        response.headers["X-User-Projects"] = " | ".join(user.projects)
+    projects = get_projects_header(claims)
+
+    if projects:
+        response.headers["X-User-Projects"] = projects
 
     return response
 
 
-@auth_router.post("/me/permissions")
+@auth_router.post("/validate-access/batch")
+async def validate_data_access_batch(
+    validate_access_batch_action: FromDishka[ValidateAccessBatchInteractor],
+    access_token: FromDishka[AccessTokenDTO],
+    data: ValidateAccessBatchShema
+) -> ValidateAccessBatchResultShema:
+    
+    claims, results = await validate_access_batch_action(
+        access_token=access_token, 
+        checks=data.checks
+    )
+
+    return ValidateAccessBatchResultShema(
+        projects=get_projects_header(claims),
+        results=results
+    )
+
+
+@auth_router.post("/me/permissions", response_model=PermissionDTO)
 async def permissions(
     user: FromDishka[CurrentUser],
     get_permissions: FromDishka[GetUserPermissionsInteractor]
-) -> PermissionDTO:
+) -> Response:
     res =  await get_permissions(user)
     
     if not res:
         raise PermissionDataNotFound(user_ident=user.ident)
     
-    return res
+    return Response(
+        PERMISSION_ADAPTER.dump_json(res, by_alias=True),
+        media_type="application/json"
+    )
 
 
-@auth_router.post("/me")
-async def me(user: FromDishka[CurrentUser]) -> UserWithouPasswordShema:
-    return user
+@auth_router.post("/me", response_model=UserWithouPasswordShema)
+async def me(user: FromDishka[CurrentUser]) -> ORJSONResponse:
+    return ORJSONResponse(
+        UserWithouPasswordShema.model_validate(user, from_attributes=True).model_dump(mode="json", by_alias=True, include=ME_FIELDS)
+    )
+
+
+@auth_router.get("/.well-known/jwks.json")
+async def jwks(jwt_service: FromDishka[JwtService]) -> JSONResponse:
+    return JSONResponse(
+        content={"keys": jwt_service.jwks},
+        headers={
+            "Cache-Control": f"public, max-age={ApplicationConfig.JWKS_MAX_AGE()}"
+        }
+    )
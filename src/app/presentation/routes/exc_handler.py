@@ -11,10 +11,12 @@ from app.application.common.exc import (
     InvalidRefreshToken,
     RefreshTokenRevoked,
     RefreshTokenExpired,
+    AccessTokenExpired,
     InvalidAccessToken,
     PermissionDataNotFound,
     OriginalMethodNotFound,
-    OriginalUriNotFound
+    OriginalUriNotFound,
+    LoginThrottled
 )
 
 
@@ -178,6 +180,22 @@ async def refresh_token_expired_handler(
     )
 
 
+async def access_token_expired_handler(
+    request: Request,
+    exception: AccessTokenExpired
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=403,
+        content={
+            "code": exception.code,
+            "detail": "access token expired"
+        },
+        headers={
+            "X-Auth-Code": exception.code
+        }
+    )
+
+
 async def permission_data_not_found_handler(
     request: Request,
     exception: PermissionDataNotFound
@@ -222,3 +240,20 @@ async def original_uri_not_found_handler(
             "X-Auth-Code": exception.code
         }
     )
+
+
+async def login_throttled_handler(
+    request: Request,
+    exception: LoginThrottled
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={
+            "code": exception.code,
+            "detail": f"too many login attempts; retry after {exception.retry_after} seconds"
+        },
+        headers={
+            "X-Auth-Code": exception.code,
+            "Retry-After": str(exception.retry_after)
+        }
+    )
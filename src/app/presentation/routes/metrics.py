@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CollectorRegistry, REGISTRY, CONTENT_TYPE_LATEST, generate_latest, multiprocess
+
+from app.config import ApplicationConfig
+
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    multiproc_dir = ApplicationConfig.PROMETHEUS_MULTIPROC_DIR()
+
+    if multiproc_dir:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=str(multiproc_dir))
+    else:
+        registry = REGISTRY
+
+    return Response(
+        generate_latest(registry),
+        media_type=CONTENT_TYPE_LATEST
+    )
@@ -1,20 +1,28 @@
 from uuid import UUID
+from datetime import datetime
 from typing import Annotated
+from collections.abc import AsyncIterator
 
 from fastapi import APIRouter, Response, Request, Query
-from dishka import FromDishka
+from fastapi.responses import StreamingResponse
+from fastapi.exceptions import RequestValidationError
+from dishka import FromDishka, AsyncContainer
 from dishka.integrations.fastapi import inject
+from naks_library.utils.validators import before_optional_datetime_validator
 
-from app.application.dto import UserDTO
+from app.application.dto import UserDTO, UserFilterDTO
 from app.application.common.exc import UserNotFound
 from app.application.interactors import (
     CreateUserInteractor, 
     UpdateUserInteractor, 
     GetUserInteractor, 
+    GetUsersInteractor,
+    ListUsersInteractor,
+    StreamUsersInteractor,
     DeleteUserInteractor,
     ValidateAccessInteractor
 )
-from app.presentation.shemas import CreateUserShema, UpdateUserShema
+from app.presentation.shemas import CreateUserShema, UpdateUserShema, UserWithouPasswordShema
 from app.infrastructure.dto import AccessTokenDTO
  
 
@@ -22,6 +30,15 @@ user_router = APIRouter(
     prefix="/v1/user"
 )
 
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def dump_users_ndjson(users: AsyncIterator[UserDTO]) -> AsyncIterator[str]:
+    async for user in users:
+        yield UserWithouPasswordShema.model_validate(user, from_attributes=True).model_dump_json(by_alias=True) + "\n"
+
+
 @user_router.post("/")
 @inject
 async def create_user(
@@ -34,7 +51,7 @@ async def create_user(
     
     await validate_access(access_token, request)
 
-    await create_user(data.to_dto())
+    await create_user(data.to_dto(), data.password)
 
     return Response(
         "user successfully created"
@@ -61,6 +78,70 @@ async def get_user(
     raise UserNotFound(ident)
 
 
+@user_router.get("/list")
+@inject
+async def list_users(
+    access_token: FromDishka[AccessTokenDTO],
+    validate_access: FromDishka[ValidateAccessInteractor],
+    request: Request,
+    container: FromDishka[AsyncContainer],
+    limit: Annotated[int, Query(ge=1, le=10000)] = 100,
+    after_sign_dt: Annotated[datetime | None, before_optional_datetime_validator, Query()] = None,
+    after_ident: Annotated[UUID | None, Query()] = None,
+    project: Annotated[str | None, Query()] = None,
+    login_prefix: Annotated[str | None, Query()] = None
+) -> list[UserWithouPasswordShema]:
+    
+    await validate_access(access_token, request)
+
+    if (after_sign_dt is None) != (after_ident is None):
+        raise RequestValidationError(
+            [
+                {
+                    "type": "missing",
+                    "loc": ("query", "after_ident" if after_ident is None else "after_sign_dt"),
+                    "msg": "after_sign_dt and after_ident must be given together",
+                    "input": None
+                }
+            ]
+        )
+
+    filters = UserFilterDTO(
+        limit=limit,
+        after_sign_dt=after_sign_dt,
+        after_ident=after_ident,
+        project=project,
+        login_prefix=login_prefix
+    )
+
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        stream_users = await container.get(StreamUsersInteractor)
+
+        return StreamingResponse(
+            dump_users_ndjson(stream_users(filters)),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+
+    list_users = await container.get(ListUsersInteractor)
+
+    return await list_users(filters)
+
+
+@user_router.get("/bulk")
+@inject
+async def get_users(
+    ident: Annotated[list[UUID], Query(min_length=1, max_length=500)],
+    access_token: FromDishka[AccessTokenDTO],
+    validate_access: FromDishka[ValidateAccessInteractor],
+    request: Request,
+    get_users: FromDishka[GetUsersInteractor]
+) -> list[UserWithouPasswordShema]:
+    
+    await validate_access(access_token, request)
+
+    return await get_users(ident)
+
+
 @user_router.patch("/")
 @inject
 async def update_user(
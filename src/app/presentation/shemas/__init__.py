@@ -1 +1,2 @@
-from app.presentation.shemas.user import UpdateUserShema, CreateUserShema, UserWithouPasswordShema
\ No newline at end of file
+from app.presentation.shemas.user import UpdateUserShema, CreateUserShema, UserWithouPasswordShema
+from app.presentation.shemas.auth import ValidateAccessBatchShema, ValidateAccessBatchResultShema
@@ -0,0 +1,13 @@
+from pydantic import Field
+from naks_library import BaseShema
+
+from app.application.dto import AccessCheckDTO, AccessCheckResultDTO
+
+
+class ValidateAccessBatchShema(BaseShema):
+    checks: list[AccessCheckDTO] = Field(min_length=1, max_length=100)
+
+
+class ValidateAccessBatchResultShema(BaseShema):
+    projects: str | None
+    results: list[AccessCheckResultDTO]
@@ -0,0 +1,61 @@
+from collections.abc import Iterator
+from typing import Any, TextIO
+import json
+import re
+
+
+WHITESPACE = re.compile(r"\s*")
+ARRAY_SEPARATOR = re.compile(r"[\s,]*")
+
+
+def iter_json_records(file: TextIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    separator = WHITESPACE
+    buffer, pos = "", 0
+    eof, started, is_array, need_more = False, False, False, False
+
+    while True:
+        pos = separator.match(buffer, pos).end()
+
+        if pos == len(buffer) or need_more:
+            if eof:
+                break
+
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            need_more = False
+            continue
+
+        if not started:
+            started = True
+            is_array = buffer[pos] == "["
+
+            if is_array:
+                separator = ARRAY_SEPARATOR
+                pos += 1
+
+            continue
+
+        if is_array and buffer[pos] == "]":
+            return
+
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+
+            need_more = True
+            continue
+
+        if end == len(buffer) and not eof:
+            need_more = True
+            continue
+
+        pos = end
+
+        yield record
+
+    if is_array:
+        raise ValueError("unterminated JSON array")
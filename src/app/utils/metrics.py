@@ -0,0 +1,125 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import perf_counter
+
+from prometheus_client import Counter, Gauge, Histogram
+
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+REQUEST_SECONDS = Histogram(
+    "auth_request_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+
+STAGE_SECONDS = Histogram(
+    "auth_stage_seconds",
+    "Time spent in an instrumented stage (jwt_decode, redis_get, redis_set, redis_delete, db_query, commit, hash, hash_verify)",
+    ["stage"],
+    buckets=LATENCY_BUCKETS
+)
+
+TOKEN_CACHE_REQUESTS = Counter(
+    "auth_token_cache_requests_total",
+    "Decoded JWT lookups in the per-worker token cache",
+    ["result"]
+)
+
+PRINCIPAL_LOCAL_CACHE_REQUESTS = Counter(
+    "auth_principal_local_cache_requests_total",
+    "Principal lookups in the per-worker local cache",
+    ["result"]
+)
+
+
+PRINCIPAL_CACHE_REQUESTS = Counter(
+    "auth_principal_cache_requests_total",
+    "Principal (user + permission mask) lookups in the Redis cache",
+    ["result"]
+)
+
+PRINCIPAL_CACHE_WRITES = Counter(
+    "auth_principal_cache_writes_total",
+    "Principal keys written to the Redis cache"
+)
+
+REFRESH_TOKEN_CACHE_REQUESTS = Counter(
+    "auth_refresh_token_cache_requests_total",
+    "Refresh token lookups in the Redis cache",
+    ["result"]
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "auth_db_pool_checked_out_connections",
+    "Database connections currently checked out of the pool",
+    multiprocess_mode="livesum"
+)
+
+DB_POOL_IDLE = Gauge(
+    "auth_db_pool_idle_connections",
+    "Idle database connections held by the pool",
+    multiprocess_mode="livesum"
+)
+
+DB_POOL_CAPACITY = Gauge(
+    "auth_db_pool_capacity_connections",
+    "Maximum number of connections the pool may open (pool size + max overflow)",
+    multiprocess_mode="livesum"
+)
+
+DB_POOL_WAIT_SECONDS = Histogram(
+    "auth_db_pool_wait_seconds",
+    "Time spent acquiring a connection from the pool",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+HASHER_QUEUE_DEPTH = Gauge(
+    "auth_password_hasher_queue_depth",
+    "Password hash/verify calls waiting for a hasher worker",
+    multiprocess_mode="livesum"
+)
+
+HASHER_IN_FLIGHT = Gauge(
+    "auth_password_hasher_in_flight",
+    "Password hash/verify calls currently running on a hasher worker",
+    multiprocess_mode="livesum"
+)
+
+LOGIN_THROTTLE_REJECTIONS = Counter(
+    "auth_login_throttle_rejections_total",
+    "Login attempts rejected by the login throttle"
+)
+
+LOGIN_THROTTLE_FALLBACKS = Counter(
+    "auth_login_throttle_fallbacks_total",
+    "Login throttle checks served by the in-memory fallback because Redis failed"
+)
+
+REFRESH_TOKENS_PRUNED = Counter(
+    "auth_refresh_tokens_pruned_total",
+    "Expired refresh tokens deleted by the prune job"
+)
+
+REFRESH_TOKEN_PRUNE_RUNS = Counter(
+    "auth_refresh_token_prune_runs_total",
+    "Refresh token prune runs",
+    ["result"]
+)
+
+REFRESH_TOKEN_PRUNE_SECONDS = Histogram(
+    "auth_refresh_token_prune_seconds",
+    "Duration of refresh token prune runs that held the lock"
+)
+
+
+@contextmanager
+def observe_stage(stage: str) -> Iterator[None]:
+    start = perf_counter()
+
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage=stage).observe(perf_counter() - start)
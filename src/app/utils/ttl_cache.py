@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from threading import Lock
+from time import time
+
+
+class TTLCache[K: Hashable, V]:
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = Lock()
+
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            item = self._data.get(key)
+
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = item
+
+            if expires_at <= time():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+
+    def set(self, key: K, value: V, expires_at: float | None = None) -> None:
+        now = time()
+        expires_at = min(now + self.ttl, expires_at) if expires_at else now + self.ttl
+
+        if expires_at <= now or self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+    def delete(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,73 +1,233 @@
+from collections.abc import Iterator, AsyncIterator
+from typing import IO, Any, TextIO
+from datetime import timedelta
+from itertools import batched
 import pathlib
-import json
 import asyncio
+import gzip
+import json
+import csv
+import io
 
 import click
+from pydantic import TypeAdapter
 from naks_library.committer import SqlAlchemyCommitter
 
-from app.application.dto import CreatePermissionDTO, CreateUserDTO
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.dto import CreatePermissionDTO, CreateUserDTO, UserDTO, PermissionDTO, RefreshTokenDTO
 from app.infrastructure.database.setup import create_engine, create_session_maker
-from app.infrastructure.database.mappers import PermissionMapper
+from app.infrastructure.database.mappers import UserMapper, PermissionMapper, RefreshTokenMapper
+from app.infrastructure.redis.setup import create_redis
+from app.infrastructure.redis.redis_mapper import RedisMapper
+from app.infrastructure.services.token_pruner import RefreshTokenPruner
+from app.utils.json_stream import iter_json_records
+from app.config import ApplicationConfig
 
 
 @click.group()
 def cli(): ...
 
 
-engine = create_engine()
+engine = create_engine(pool_mode="null")
 session_maker = create_session_maker(engine)
 
 
-async def add_permissions(data: list[CreatePermissionDTO]):
-    async with session_maker() as session:
+IMPORT_BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 5000
+GZIP_MAGIC = b"\x1f\x8b"
+
+EXPORT_DTOS = {
+    "users": UserDTO,
+    "permissions": PermissionDTO,
+    "refresh-tokens": RefreshTokenDTO
+}
+
+
+def open_src(path: pathlib.Path) -> TextIO:
+    with open(path, "rb") as file:
+        compressed = file.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+
+    if compressed:
+        return gzip.open(path, "rt", encoding="utf-8")
+    
+    return open(path, "r", encoding="utf-8")
+
+
+def open_dst(path: pathlib.Path, fmt: str, compress: bool) -> IO:
+    file = gzip.open(path, "wb", compresslevel=6) if compress else open(path, "wb")
+
+    if fmt == "csv":
+        return io.TextIOWrapper(file, encoding="utf-8", newline="")
+    
+    return file
+
+
+def read_batches[T](path: pathlib.Path, adapter: TypeAdapter[list[T]], batch_size: int) -> Iterator[list[T]]:
+    with open_src(path) as file:
+        for batch in batched(iter_json_records(file), batch_size):
+            yield adapter.validate_python(batch)
+
+
+def check_src_path(src_path: str) -> pathlib.Path:
+    path = pathlib.Path(src_path)
+
+    if not path.exists():
+        raise ValueError(f"path ({src_path}) not exists")
+    
+    return path
+
+
+async def add_permissions(path: pathlib.Path, batch_size: int) -> int:
+    total = 0
+
+    async with session_maker() as session, create_redis() as redis:
         committer = SqlAlchemyCommitter(session)
         mapper = PermissionMapper(session)
+        redis_mapper = RedisMapper(redis)
 
-        for el in data:
-            await mapper.insert(el)
+        for batch in read_batches(path, TypeAdapter(list[CreatePermissionDTO]), batch_size):
+            total += await mapper.upsert_many(batch)
 
-        await committer.commit()
+            await committer.commit()
+            await redis_mapper.invalidate_principals({el.user_ident for el in batch})
+
+            click.echo(f"{total} permissions imported", err=True)
+
+    return total
 
 
 @cli.command("add-permissions")
 @click.option("--src-path", "-sp", type=str)
+@click.option("--batch-size", "-bs", type=int, default=IMPORT_BATCH_SIZE)
 def add_permissions_command(
     src_path: str,
+    batch_size: int
 ):
-    path = pathlib.Path(src_path)
+    total = asyncio.run(add_permissions(check_src_path(src_path), batch_size))
 
-    if not path.exists():
-        raise ValueError(f"path ({src_path}) not exists")
-    
-    data = [CreatePermissionDTO(**el) for el in json.load(open(path, "r", encoding="utf-8"))]
+    click.echo(f"{total} permissions imported")
 
-    asyncio.run(add_permissions(data))
 
+async def add_users(path: pathlib.Path, batch_size: int) -> int:
+    total = 0
 
-async def add_users(data: list[CreateUserDTO]):
-    async with session_maker() as session:
+    async with session_maker() as session, create_redis() as redis:
         committer = SqlAlchemyCommitter(session)
-        mapper = PermissionMapper(session)
+        mapper = UserMapper(session)
+        redis_mapper = RedisMapper(redis)
+
+        for batch in read_batches(path, TypeAdapter(list[CreateUserDTO]), batch_size):
+            total += await mapper.upsert_many(batch)
+
+            await committer.commit()
+            await redis_mapper.invalidate_principals({el.ident for el in batch})
 
-        for el in data:
-            await mapper.insert(el)
+            click.echo(f"{total} users imported", err=True)
 
-        await committer.commit()
+    return total
 
 
 @cli.command("add-users")
 @click.option("--src-path", "-sp", type=str)
+@click.option("--batch-size", "-bs", type=int, default=IMPORT_BATCH_SIZE)
 def add_users_command(
     src_path: str,
+    batch_size: int
 ):
-    path = pathlib.Path(src_path)
+    total = asyncio.run(add_users(check_src_path(src_path), batch_size))
 
-    if not path.exists():
-        raise ValueError(f"path ({src_path}) not exists")
-    
-    data = [CreateUserDTO(**el) for el in json.load(open(path, "r", encoding="utf-8"))]
+    click.echo(f"{total} users imported")
+
+
+def export_batches(session: AsyncSession, table: str, batch_size: int) -> AsyncIterator[list[Any]]:
+    match table:
+        case "users":
+            return UserMapper(session).stream_all(batch_size)
+        case "permissions":
+            return PermissionMapper(session).stream_all(batch_size)
+        case "refresh-tokens":
+            return RefreshTokenMapper(session).stream_active(batch_size)
+        
+    raise ValueError(f"unknown table ({table})")
+
+
+def to_csv_row(data: dict[str, Any]) -> dict[str, Any]:
+    return {key: json.dumps(value) if isinstance(value, (list, dict)) else value for key, value in data.items()}
+
+
+async def export(table: str, path: pathlib.Path, fmt: str, compress: bool, batch_size: int, include_password_hashes: bool = False) -> int:
+    adapter = TypeAdapter(EXPORT_DTOS[table])
+    exclude = None if include_password_hashes else {"hashed_password"}
+    writer: csv.DictWriter | None = None
+    total = 0
+
+    async with session_maker() as session:
+        with open_dst(path, fmt, compress) as file:
+            async for batch in export_batches(session, table, batch_size):
+                if fmt == "ndjson":
+                    file.write(b"".join(adapter.dump_json(el, by_alias=True, exclude=exclude) + b"\n" for el in batch))
+                else:
+                    rows = [to_csv_row(adapter.dump_python(el, mode="json", by_alias=True, exclude=exclude)) for el in batch]
+
+                    if writer is None:
+                        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+                        writer.writeheader()
+
+                    writer.writerows(rows)
+
+                total += len(batch)
+
+                click.echo(f"{total} rows exported", err=True)
+
+    return total
+
+
+@cli.command("export")
+@click.option("--table", "-t", type=click.Choice(list(EXPORT_DTOS)), required=True)
+@click.option("--dst-path", "-dp", type=str, required=True)
+@click.option("--format", "-f", "fmt", type=click.Choice(["ndjson", "csv"]), default="ndjson")
+@click.option("--gzip", "-z", "compress", is_flag=True, default=False)
+@click.option("--batch-size", "-bs", type=int, default=EXPORT_BATCH_SIZE)
+@click.option("--include-password-hashes", is_flag=True, default=False)
+def export_command(
+    table: str,
+    dst_path: str,
+    fmt: str,
+    compress: bool,
+    batch_size: int,
+    include_password_hashes: bool
+):
+    total = asyncio.run(export(table, pathlib.Path(dst_path), fmt, compress, batch_size, include_password_hashes))
+
+    click.echo(f"{total} rows exported to {dst_path}")
+
+
+async def prune_refresh_tokens(retention_hours: int, batch_size: int) -> int | None:
+    async with create_redis() as redis:
+        pruner = RefreshTokenPruner(
+            session_maker=session_maker,
+            redis_engine=redis,
+            retention=timedelta(hours=retention_hours),
+            batch_size=batch_size
+        )
+
+        return await pruner.prune()
+
+
+@cli.command("prune-refresh-tokens")
+@click.option("--retention-hours", "-rh", type=int, default=ApplicationConfig.REFRESH_TOKEN_RETENTION_HOURS)
+@click.option("--batch-size", "-bs", type=int, default=ApplicationConfig.REFRESH_TOKEN_PRUNE_BATCH_SIZE)
+def prune_refresh_tokens_command(
+    retention_hours: int,
+    batch_size: int
+):
+    deleted = asyncio.run(prune_refresh_tokens(retention_hours, batch_size))
 
-    asyncio.run(add_users(data))
+    if deleted is None:
+        click.echo("another prune run holds the lock; skipped")
+    else:
+        click.echo(f"{deleted} expired refresh tokens deleted")
 
 
 if __name__ == "__main__":
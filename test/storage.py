@@ -2,6 +2,8 @@ from uuid import UUID, uuid4
 from datetime import datetime, timedelta
 from itertools import batched
 
+from hashlib import sha256
+
 from faker import Faker
 
 from app.infrastructure.services.hasher import PasswordHasher
@@ -30,7 +32,7 @@ class FakeUserDataGenerator(IFakeDataGenerator):
             sub_data["name"] = self.faker.name()
             sub_data["login"] = self._gen_login(sub_data["name"])
             sub_data["password"] = "QWE123df"
-            sub_data["hashed_password"] = self.hasher.hash(sub_data["password"])
+            sub_data["hashed_password"] = self.hasher.hash(sub_data["password"]) if i % 2 else sha256(sub_data["password"].encode()).hexdigest()
             sub_data["email"] = self.faker.email()
             sub_data["projects"] = [self.faker.random_element(PROJECTS)]
             sub_data["sign_dt"] = self.faker.date_time()
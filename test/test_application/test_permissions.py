@@ -0,0 +1,30 @@
+import sqlalchemy as sa
+
+from app.application.common.permissions import PERMISSION_FLAGS, PERMISSION_BITS, SUPER_USER_BIT, convert_permission_flags_to_mask
+from app.application.dto import PermissionClaims
+from app.infrastructure.database.models import PermissionModel
+
+from storage import storage
+
+
+class TestPermissionMask:
+
+    def test_registry_matches_permission_model(self):
+        columns = {column.name for column in PermissionModel.__table__.columns if isinstance(column.type, sa.Boolean)}
+
+        assert set(PERMISSION_FLAGS) == columns
+        assert len(PERMISSION_FLAGS) == len(columns)
+
+
+    def test_round_trip(self):
+        for permission in storage.fake_permissions:
+            mask = convert_permission_flags_to_mask(getattr(permission, name) for name in PERMISSION_FLAGS)
+
+            assert {name: bool(mask & bit) for name, bit in PERMISSION_BITS.items()} == {name: bool(getattr(permission, name)) for name in PERMISSION_FLAGS}
+
+
+    def test_claims(self):
+        claims = PermissionClaims(projects=None, mask=SUPER_USER_BIT)
+
+        assert claims.is_super_user
+        assert not claims.has(SUPER_USER_BIT << 1)
@@ -0,0 +1,122 @@
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+import asyncio
+import json
+import csv
+import gzip
+
+import pytest
+from click.testing import CliRunner
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.dto import CreateUserDTO, CreatePermissionDTO
+from app.application.common.permissions import PERMISSION_FLAGS
+from app.infrastructure.database.mappers import UserMapper, PermissionMapper
+from app.infrastructure.database.models import UserModel
+from cli import cli
+
+from utils import engine
+
+
+NOW = datetime.now().replace(microsecond=0)
+
+USERS = [
+    CreateUserDTO(
+        ident=uuid4(),
+        login=f"export-{i}",
+        name=f"export {i}",
+        email=None,
+        projects=["first", "second"] if i % 2 else None,
+        hashed_password=f"$scrypt$hash-{i}",
+        sign_dt=NOW,
+        update_dt=NOW,
+        login_dt=NOW
+    ) for i in range(5)
+]
+
+PERMISSIONS = [
+    CreatePermissionDTO(ident=uuid4(), user_ident=user.ident, **{name: (i + j) % 2 == 0 for j, name in enumerate(PERMISSION_FLAGS)})
+    for i, user in enumerate(USERS)
+]
+
+
+async def seed() -> None:
+    async with AsyncSession(engine) as session:
+        await UserMapper(session).upsert_many(USERS)
+        await PermissionMapper(session).upsert_many(PERMISSIONS)
+        await session.commit()
+
+
+async def delete_users() -> None:
+    async with AsyncSession(engine) as session:
+        await session.execute(delete(UserModel).where(UserModel.ident.in_([user.ident for user in USERS])))
+        await session.commit()
+
+
+async def load() -> tuple[list, list]:
+    async with AsyncSession(engine) as session:
+        users = [await UserMapper(session).get(user.ident) for user in USERS]
+        permissions = [await PermissionMapper(session).get_by_user_ident(user.ident) for user in USERS]
+
+    return users, permissions
+
+
+def invoke(*args: str) -> None:
+    res = CliRunner().invoke(cli, list(args), catch_exceptions=False)
+
+    assert res.exit_code == 0, res.output
+
+
+@pytest.fixture
+def seeded(prepare_db) -> None:
+    asyncio.run(seed())
+
+
+@pytest.mark.usefixtures("seeded")
+class TestExport:
+
+    def test_ndjson_round_trip(self, tmp_path: Path):
+        users_path, permissions_path = tmp_path / "users.ndjson", tmp_path / "permissions.ndjson"
+
+        invoke("export", "-t", "users", "-dp", str(users_path), "--include-password-hashes")
+        invoke("export", "-t", "permissions", "-dp", str(permissions_path))
+
+        expected = asyncio.run(load())
+
+        asyncio.run(delete_users())
+
+        invoke("add-users", "-sp", str(users_path))
+        invoke("add-permissions", "-sp", str(permissions_path))
+
+        assert asyncio.run(load()) == expected
+
+
+    def test_gzip(self, tmp_path: Path):
+        path = tmp_path / "users.ndjson.gz"
+
+        invoke("export", "-t", "users", "-dp", str(path), "--gzip")
+
+        assert path.read_bytes()[:2] == b"\x1f\x8b"
+
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            records = [json.loads(line) for line in file]
+
+        assert {record["login"] for record in records} == {user.login for user in USERS}
+        assert all("hashedPassword" not in record for record in records)
+
+
+    def test_csv(self, tmp_path: Path):
+        path = tmp_path / "users.csv"
+
+        invoke("export", "-t", "users", "-dp", str(path), "-f", "csv")
+
+        with open(path, encoding="utf-8", newline="") as file:
+            reader = csv.DictReader(file)
+            rows = {row["login"]: row for row in reader}
+
+        assert reader.fieldnames == ["ident", "login", "name", "email", "projects", "signDt", "updateDt", "loginDt"]
+
+        for user in USERS:
+            assert rows[user.login]["projects"] == (json.dumps(user.projects) if user.projects is not None else "")
@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from pydantic import RootModel
+
+from app.application.dto import UserDTO, RefreshTokenDTO
+from app.infrastructure.redis.codec import encode_user, decode_user, encode_refresh_token, decode_refresh_token
+
+from storage import storage
+
+
+class TestCacheCodec:
+
+    def test_user_round_trip(self):
+        for user in storage.fake_users:
+            assert decode_user(encode_user(user)) == user
+
+
+    def test_refresh_token_round_trip(self):
+        now = datetime.now()
+        refresh_token = RefreshTokenDTO(ident=uuid4(), user_ident=uuid4(), token=None, revoked=False, gen_dt=now, exp_dt=now + timedelta(hours=1))
+
+        assert decode_refresh_token(encode_refresh_token(refresh_token)) == refresh_token
+
+
+    def test_unknown_schema_version_is_a_miss(self):
+        user = storage.fake_users[0]
+
+        assert decode_user(RootModel[UserDTO](user).model_dump_json().encode()) is None
+        assert decode_user(bytes([0]) + encode_user(user)[1:]) is None
@@ -0,0 +1,42 @@
+from hashlib import sha256
+
+import pytest
+
+from app.infrastructure.services.hasher import PasswordHasher, AsyncPasswordHasher
+
+
+class TestPasswordHasher:
+    hasher = PasswordHasher(log_n=10, r=8, p=1)
+
+
+    def test_scrypt_round_trip(self):
+        hashed_password = self.hasher.hash("QWE123df")
+
+        assert hashed_password.startswith("$scrypt$ln=10,r=8,p=1$")
+        assert hashed_password != self.hasher.hash("QWE123df")
+        assert self.hasher.verify("QWE123df", hashed_password)
+        assert not self.hasher.verify("qwe123df", hashed_password)
+        assert not self.hasher.needs_rehash(hashed_password)
+
+
+    def test_legacy_sha256(self):
+        hashed_password = sha256(b"QWE123df").hexdigest()
+
+        assert self.hasher.verify("QWE123df", hashed_password)
+        assert not self.hasher.verify("qwe123df", hashed_password)
+        assert self.hasher.needs_rehash(hashed_password)
+
+
+    def test_rehash_on_changed_parameters(self):
+        assert PasswordHasher(log_n=11, r=8, p=1).needs_rehash(self.hasher.hash("QWE123df"))
+
+
+    @pytest.mark.anyio
+    async def test_async_hasher(self):
+        async_hasher = AsyncPasswordHasher(self.hasher, max_workers=2)
+
+        hashed_password = await async_hasher.hash("QWE123df")
+
+        assert await async_hasher.verify("QWE123df", hashed_password)
+
+        async_hasher.shutdown()
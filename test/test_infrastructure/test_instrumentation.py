@@ -0,0 +1,21 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from utils import engine
+
+
+class TestInstrumentation:
+
+    @pytest.mark.anyio
+    async def test_failed_query_does_not_leak_start_time(self):
+        async with engine.connect() as conn:
+            with pytest.raises(DBAPIError):
+                await conn.execute(text("select 1 / 0"))
+
+            assert not conn.sync_connection.info.get("query_start")
+
+            await conn.rollback()
+            await conn.execute(text("select 1"))
+
+            assert not conn.sync_connection.info.get("query_start")
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from ecdsa import SigningKey, NIST256p
+from jose.exceptions import JWTError, JWTClaimsError, ExpiredSignatureError
+from jose.jwt import encode as jwt_encode
+
+from app.infrastructure.services.jwt_service import JwtService, LEGACY_DATETIME_FORMAT
+
+
+@pytest.fixture
+def asymmetric_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "private.pem").write_bytes(SigningKey.generate(curve=NIST256p).to_pem())
+
+    monkeypatch.setenv("JWT_ALGORITHM", "ES256")
+    monkeypatch.setenv("JWT_PRIVATE_KEY_PATH", str(tmp_path / "private.pem"))
+
+
+def legacy_hs256_token() -> str:
+    now = datetime.now()
+
+    return jwt_encode(
+        {"v": 2, "user_ident": uuid4().hex, "iat": int(now.timestamp()), "exp": int((now + timedelta(minutes=5)).timestamp())},
+        JwtService().secret_key,
+        "HS256"
+    )
+
+
+def legacy_format_token(lifetime: timedelta = timedelta(minutes=5)) -> str:
+    now = datetime.now()
+    jwt_service = JwtService()
+
+    return jwt_encode(
+        {"user_ident": uuid4().hex, "gen_dt": now.strftime(LEGACY_DATETIME_FORMAT), "exp_dt": (now + lifetime).strftime(LEGACY_DATETIME_FORMAT)},
+        jwt_service.secret_key,
+        jwt_service.algorithm
+    )
+
+
+class TestJwtService:
+
+    @pytest.mark.usefixtures("asymmetric_env")
+    def test_legacy_hs256_rejected_by_default(self):
+        token = legacy_hs256_token()
+
+        with pytest.raises(JWTError):
+            JwtService().decode(token)
+
+
+    @pytest.mark.usefixtures("asymmetric_env")
+    def test_legacy_hs256_accepted_when_enabled(self, monkeypatch: pytest.MonkeyPatch):
+        token = legacy_hs256_token()
+
+        monkeypatch.setenv("JWT_ACCEPT_LEGACY_HS256", "true")
+
+        assert "user_ident" in JwtService().decode(token)
+
+
+    def test_missing_private_key_path(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("JWT_ALGORITHM", "ES256")
+        monkeypatch.delenv("JWT_PRIVATE_KEY_PATH", raising=False)
+
+        with pytest.raises(ValueError, match="JWT_PRIVATE_KEY_PATH"):
+            JwtService()
+
+
+    def test_legacy_format_accepted_when_enabled(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("LEGACY_TOKEN_FORMAT_ACCEPTED", "true")
+
+        token = legacy_format_token()
+        payload = JwtService().read_access_token(token)
+
+        assert payload["exp_dt"] > datetime.now()
+        assert payload["permissions"] is None
+
+
+    def test_legacy_format_rejected_when_disabled(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("LEGACY_TOKEN_FORMAT_ACCEPTED", "false")
+
+        with pytest.raises(JWTClaimsError):
+            JwtService().decode(legacy_format_token())
+
+
+    def test_expired_legacy_format_rejected(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("LEGACY_TOKEN_FORMAT_ACCEPTED", "true")
+
+        with pytest.raises(ExpiredSignatureError):
+            JwtService().decode(legacy_format_token(timedelta(minutes=-5)))
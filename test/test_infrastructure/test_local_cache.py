@@ -0,0 +1,79 @@
+from uuid import uuid4
+import asyncio
+
+import pytest
+
+from app.infrastructure.redis.local_cache import PrincipalCache
+from app.infrastructure.redis.setup import create_redis
+
+
+class TestPrincipalCache:
+
+    def test_partial_entries(self):
+        cache = PrincipalCache(maxsize=10, ttl=60)
+        ident = uuid4()
+
+        cache.set(ident, permission_mask=5)
+
+        assert cache.get(ident) == (None, 5)
+
+        cache.invalidate(ident)
+
+        assert cache.get(ident) == (None, None)
+
+
+    def test_stale_set_after_invalidation_is_skipped(self):
+        cache = PrincipalCache(maxsize=10, ttl=60)
+        ident, other = uuid4(), uuid4()
+
+        generation = cache.generation(ident)
+
+        cache.invalidate(other)
+        cache.set(ident, permission_mask=1, generation=generation)
+
+        assert cache.get(ident) == (None, 1)
+
+        generation = cache.generation(ident)
+
+        cache.invalidate(ident)
+        cache.set(ident, permission_mask=2, generation=generation)
+
+        assert cache.get(ident) == (None, None)
+
+        generation = cache.generation(ident)
+
+        cache.clear()
+        cache.set(ident, permission_mask=3, generation=generation)
+
+        assert cache.get(ident) == (None, None)
+
+
+    @pytest.mark.anyio
+    async def test_invalidation_message_evicts_entry(self):
+        cache = PrincipalCache(maxsize=10, ttl=60)
+        ident = uuid4()
+        channel = f"test-invalidation:{uuid4().hex}"
+
+        async with create_redis() as redis_engine:
+            listener = asyncio.create_task(cache.listen(redis_engine, channel))
+
+            while (await redis_engine.pubsub_numsub(channel))[0][1] == 0:
+                await asyncio.sleep(0.01)
+
+            cache.set(ident, permission_mask=1)
+
+            await redis_engine.publish(channel, "not-a-uuid")
+            await redis_engine.publish(channel, b"\xff")
+            await redis_engine.publish(channel, ident.hex)
+
+            for _ in range(100):
+                if cache.get(ident) == (None, None):
+                    break
+
+                await asyncio.sleep(0.01)
+
+            assert not listener.done()
+
+            listener.cancel()
+
+        assert cache.get(ident) == (None, None)
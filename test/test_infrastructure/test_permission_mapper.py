@@ -0,0 +1,42 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.dto import CreateUserDTO, CreatePermissionDTO
+from app.application.common.permissions import PERMISSION_FLAGS, SUPER_USER_BIT
+from app.infrastructure.database.mappers import UserMapper, PermissionMapper
+from app.infrastructure.database.models import PermissionModel
+
+from utils import engine
+
+
+@pytest.mark.usefixtures("prepare_db")
+class TestPermissionMapper:
+
+    @pytest.mark.anyio
+    async def test_reimport_updates_existing_permission(self):
+        now = datetime.now()
+        user = CreateUserDTO(ident=uuid4(), login=f"reimport-{uuid4().hex}", name="reimport", email=None, projects=None, hashed_password="", sign_dt=now, update_dt=now, login_dt=now)
+
+        first = CreatePermissionDTO(ident=uuid4(), user_ident=user.ident, **{name: False for name in PERMISSION_FLAGS})
+        second = CreatePermissionDTO(ident=uuid4(), user_ident=user.ident, **{name: name == "is_super_user" for name in PERMISSION_FLAGS})
+
+        async with AsyncSession(engine) as session:
+            await UserMapper(session).upsert_many([user])
+
+            mapper = PermissionMapper(session)
+
+            assert await mapper.upsert_many([first]) == 1
+            await session.commit()
+
+            assert await mapper.upsert_many([second]) == 1
+            await session.commit()
+
+            stmt = select(func.count()).select_from(PermissionModel).where(PermissionModel.user_ident == user.ident)
+
+            assert (await session.execute(stmt)).scalar_one() == 1
+            assert (await mapper.get_by_user_ident(user.ident)).ident == first.ident
+            assert await mapper.get_mask_by_user_ident(user.ident) == SUPER_USER_BIT
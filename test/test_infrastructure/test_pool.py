@@ -0,0 +1,39 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.infrastructure.database.pool import InstrumentedAsyncPool
+from app.config import DBConfig
+
+
+def sample(name: str) -> float:
+    return REGISTRY.get_sample_value(name) or 0
+
+
+class TestInstrumentedAsyncPool:
+
+    @pytest.mark.anyio
+    async def test_gauges_add_up_across_engines(self):
+        capacity = sample("auth_db_pool_capacity_connections")
+        checked_out = sample("auth_db_pool_checked_out_connections")
+
+        engines = [
+            create_async_engine(DBConfig.DB_URL(), poolclass=InstrumentedAsyncPool, pool_size=size, max_overflow=1)
+            for size in (2, 3)
+        ]
+
+        assert sample("auth_db_pool_capacity_connections") == capacity + 7
+
+        async with engines[0].connect() as first, engines[1].connect() as second:
+            await first.execute(text("select 1"))
+            await second.execute(text("select 1"))
+
+            assert sample("auth_db_pool_checked_out_connections") == checked_out + 2
+
+        assert sample("auth_db_pool_checked_out_connections") == checked_out
+
+        for engine in engines:
+            await engine.dispose()
+
+        assert sample("auth_db_pool_capacity_connections") == capacity + 7
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.application.dto import RefreshTokenDTO
+from app.infrastructure.redis.setup import create_redis
+from app.infrastructure.redis.local_cache import PrincipalCache
+from app.infrastructure.redis.redis_mapper import RedisMapper
+
+from storage import storage
+
+
+class TestRedisMapper:
+
+    @pytest.mark.anyio
+    async def test_refresh_token_write_back_after_revocation(self):
+        now = datetime.now()
+        refresh_token = RefreshTokenDTO(ident=uuid4(), user_ident=uuid4(), token=None, revoked=False, gen_dt=now, exp_dt=now + timedelta(hours=1))
+
+        async with create_redis() as redis_engine:
+            mapper = RedisMapper(redis_engine)
+
+            await mapper.set_refresh_token(refresh_token.ident, refresh_token)
+
+            assert await mapper.get_refresh_token(refresh_token.ident) == refresh_token
+
+            await mapper.delete_refresh_tokens([refresh_token.ident])
+            await mapper.set_refresh_token(refresh_token.ident, refresh_token)
+
+            assert await mapper.get_refresh_token(refresh_token.ident) is None
+
+
+    @pytest.mark.anyio
+    async def test_set_principal_after_invalidation_skips_local_cache(self):
+        ident = uuid4()
+        local_cache = PrincipalCache(maxsize=10, ttl=60)
+
+        async with create_redis() as redis_engine:
+            mapper = RedisMapper(redis_engine, local_cache)
+
+            generation = mapper.get_principal_generation(ident)
+
+            await mapper.invalidate_principal(ident)
+            await mapper.set_principal(ident, permission_mask=1, generation=generation)
+
+            assert local_cache.get(ident) == (None, None)
+
+            await mapper.set_principal(ident, permission_mask=2, generation=mapper.get_principal_generation(ident))
+
+            assert local_cache.get(ident) == (None, 2)
+
+            await mapper.invalidate_principal(ident)
+
+
+    @pytest.mark.anyio
+    async def test_get_principal_ttl_covers_both_keys(self):
+        ident = uuid4()
+
+        async with create_redis() as redis_engine:
+            mapper = RedisMapper(redis_engine)
+
+            await mapper.set_principal(ident, user=storage.fake_users[0], permission_mask=1)
+            await redis_engine.expire(f"permission-mask:{ident.hex}", 5)
+
+            *_, ttl = await mapper.get_principal(ident, with_ttl=True)
+
+            assert 0 <= ttl <= 5
+
+            await mapper.invalidate_principal(ident)
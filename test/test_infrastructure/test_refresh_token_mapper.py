@@ -0,0 +1,66 @@
+from uuid import uuid4
+from datetime import datetime, timedelta
+from hashlib import sha256
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.dto import CreateRefreshTokenDTO
+from app.infrastructure.database.models import RefreshTokenModel
+from app.infrastructure.database.mappers import UserMapper, RefreshTokenMapper
+
+from storage import storage
+from utils import engine
+
+
+@pytest.mark.usefixtures("prepare_db")
+class TestRefreshTokenMapper:
+
+    @pytest.mark.anyio
+    async def test_token_is_stored_as_digest(self):
+        refresh_token = storage.fake_refresh_tokens[0]
+
+        async with AsyncSession(engine) as session:
+            await UserMapper(session).insert(storage.get_fake_user(refresh_token))
+            await RefreshTokenMapper(session).insert(refresh_token)
+            await session.commit()
+
+            row = (await session.execute(select(RefreshTokenModel).where(RefreshTokenModel.ident == refresh_token.ident))).scalar_one()
+
+            assert row.token is None
+            assert row.token_hash == sha256(refresh_token.token.encode()).digest()
+
+            res = await RefreshTokenMapper(session).get(refresh_token.ident)
+
+            assert res.ident == refresh_token.ident
+            assert res.token is None
+
+
+    @pytest.mark.anyio
+    async def test_rotate_revokes_live_tokens(self):
+        user = next(user for user in storage.fake_users if user.ident != storage.fake_refresh_tokens[0].user_ident)
+        now = datetime.now()
+
+        old_token, new_token = (
+            CreateRefreshTokenDTO(
+                ident=uuid4(),
+                user_ident=user.ident,
+                token=uuid4().hex,
+                revoked=False,
+                gen_dt=now,
+                exp_dt=now + timedelta(hours=1)
+            ) for _ in range(2)
+        )
+
+        async with AsyncSession(engine) as session:
+            await UserMapper(session).insert(user)
+            await RefreshTokenMapper(session).insert(old_token)
+            await session.commit()
+
+            revoked = await RefreshTokenMapper(session).rotate(user.ident, new_token)
+            await session.commit()
+
+            assert revoked == [old_token.ident]
+            assert (await RefreshTokenMapper(session).get(old_token.ident)).revoked
+            assert not (await RefreshTokenMapper(session).get(new_token.ident)).revoked
@@ -0,0 +1,44 @@
+import pytest
+
+from app.infrastructure.services.route_matcher import RouteMatcher, load_route_matcher
+from app.application.common.permissions import PERMISSION_BITS
+from app.config import ApplicationConfig
+
+
+class TestRouteMatcher:
+
+    matcher = RouteMatcher(
+        {
+            "/v1/ndt": {"GET": "ndt_data_get", "POST": "ndt_data_create"},
+            "/v1/ndt/select": {"GET": "ndt_data_get"},
+            "/v1/ndt/{ident}": {"DELETE": "ndt_data_delete"},
+            "/v1/files/**": {"*": "acst_file_download"}
+        }
+    )
+
+    @pytest.mark.parametrize(
+        "method, uri, key",
+        [
+            ("GET", "/v1/ndt", "ndt_data_get"),
+            ("get", "/v1/ndt/", "ndt_data_get"),
+            ("POST", "v1/ndt?limit=10", "ndt_data_create"),
+            ("GET", "/v1/ndt/select", "ndt_data_get"),
+            ("DELETE", "/v1/ndt/4f1c2a", "ndt_data_delete"),
+            ("PUT", "/v1/files/a/b/c", "acst_file_download"),
+            ("PATCH", "/v1/ndt/select", None),
+            ("GET", "/v1/unknown", None),
+        ]
+    )
+    def test_match(self, method: str, uri: str, key: str | None):
+        assert self.matcher.match(method, uri) == key
+
+
+    def test_tail_wildcard_must_be_last(self):
+        with pytest.raises(ValueError):
+            RouteMatcher({"/v1/**/select": {"GET": "ndt_data_get"}})
+
+
+    def test_default_rules_reference_known_permissions(self):
+        matcher = load_route_matcher(ApplicationConfig.ACCESS_RULES_PATH(), PERMISSION_BITS)
+
+        assert matcher.match("GET", "/v1/personal-naks-certification/personal") == PERMISSION_BITS["personal_naks_certification_data_get"]
@@ -0,0 +1,54 @@
+from uuid import uuid4
+
+import pytest
+from redis.asyncio import Redis
+
+from app.application.common.exc import LoginThrottled
+from app.infrastructure.redis.setup import create_redis
+from app.infrastructure.redis.throttle import LoginThrottle
+
+
+class TestLoginThrottle:
+
+    @pytest.mark.anyio
+    async def test_login_bucket_is_exhausted(self):
+        login = uuid4().hex
+
+        async with create_redis() as redis_engine:
+            throttle = LoginThrottle(redis_engine, login_capacity=3, login_per_minute=1, ip_capacity=100, ip_per_minute=100)
+
+            for _ in range(3):
+                await throttle(login, "10.0.0.1")
+
+            with pytest.raises(LoginThrottled) as exc_info:
+                await throttle(login, "10.0.0.2")
+
+            assert exc_info.value.retry_after > 0
+
+            await throttle(uuid4().hex, "10.0.0.1")
+
+
+    @pytest.mark.anyio
+    async def test_ip_bucket_is_shared_between_logins(self):
+        client_ip = f"ip-{uuid4().hex}"
+
+        async with create_redis() as redis_engine:
+            throttle = LoginThrottle(redis_engine, login_capacity=10, login_per_minute=10, ip_capacity=2, ip_per_minute=1)
+
+            await throttle(uuid4().hex, client_ip)
+            await throttle(uuid4().hex, client_ip)
+
+            with pytest.raises(LoginThrottled):
+                await throttle(uuid4().hex, client_ip)
+
+
+    @pytest.mark.anyio
+    async def test_in_memory_fallback(self):
+        async with Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1) as redis_engine:
+            throttle = LoginThrottle(redis_engine, login_capacity=2, login_per_minute=1, ip_capacity=100, ip_per_minute=100)
+
+            await throttle("login", "10.0.0.1")
+            await throttle("login", "10.0.0.1")
+
+            with pytest.raises(LoginThrottled):
+                await throttle("login", "10.0.0.1")
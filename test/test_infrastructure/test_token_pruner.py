@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+from itertools import count
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.models import UserModel, RefreshTokenModel
+from app.infrastructure.database.setup import create_session_maker
+from app.infrastructure.redis.setup import create_redis
+from app.infrastructure.services import token_pruner
+from app.infrastructure.services.token_pruner import RefreshTokenPruner
+
+from utils import engine
+
+
+@pytest.mark.usefixtures("prepare_db")
+class TestRefreshTokenPruner:
+
+    @pytest.mark.anyio
+    async def test_prune_deletes_only_tokens_past_retention(self):
+        user_ident = uuid4()
+        now = datetime.now()
+
+        async with AsyncSession(engine) as session:
+            session.add(UserModel(ident=user_ident, name="pruner", login=f"pruner-{user_ident.hex}", hashed_password="", sign_dt=now, update_dt=now, login_dt=now))
+            await session.flush()
+
+            session.add_all(
+                RefreshTokenModel(ident=uuid4(), user_ident=user_ident, token=uuid4().hex, revoked=False, gen_dt=now, exp_dt=exp_dt)
+                for exp_dt in [now - timedelta(days=3)] * 5 + [now - timedelta(minutes=5), now + timedelta(hours=1)]
+            )
+
+            await session.commit()
+
+        async with create_redis() as redis_engine:
+            pruner = RefreshTokenPruner(create_session_maker(engine), redis_engine, retention=timedelta(days=1), batch_size=2)
+
+            assert await pruner.prune() == 5
+
+        async with AsyncSession(engine) as session:
+            stmt = select(func.count()).select_from(RefreshTokenModel).where(RefreshTokenModel.user_ident == user_ident)
+
+            assert (await session.execute(stmt)).scalar_one() == 2
+
+
+    @pytest.mark.anyio
+    async def test_prune_stops_within_lock_timeout(self, monkeypatch: pytest.MonkeyPatch):
+        user_ident = uuid4()
+        now = datetime.now()
+
+        async with AsyncSession(engine) as session:
+            session.add(UserModel(ident=user_ident, name="pruner", login=f"pruner-{user_ident.hex}", hashed_password="", sign_dt=now, update_dt=now, login_dt=now))
+            await session.flush()
+
+            session.add_all(
+                RefreshTokenModel(ident=uuid4(), user_ident=user_ident, token=uuid4().hex, revoked=False, gen_dt=now, exp_dt=now - timedelta(days=30))
+                for _ in range(10)
+            )
+
+            await session.commit()
+
+        clock = count(0, 100)
+        monkeypatch.setattr(token_pruner, "perf_counter", lambda: next(clock))
+
+        async with create_redis() as redis_engine:
+            pruner = RefreshTokenPruner(create_session_maker(engine), redis_engine, retention=timedelta(days=20), batch_size=1, lock_timeout=600)
+
+            assert await pruner.prune() == 5
+
+            monkeypatch.undo()
+
+            assert await pruner.prune() == 5
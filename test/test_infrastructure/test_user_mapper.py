@@ -0,0 +1,68 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.dto import CreateUserDTO
+from app.application.common.permissions import PERMISSION_FLAGS
+from app.infrastructure.database.mappers import UserMapper
+from app.infrastructure.database.models import PermissionModel
+
+from utils import engine
+
+
+@pytest.mark.usefixtures("prepare_db")
+class TestUserMapper:
+
+    @pytest.mark.anyio
+    async def test_upsert_many(self):
+        now = datetime.now()
+
+        users = [
+            CreateUserDTO(
+                ident=uuid4(),
+                login=f"import-{i}-{uuid4().hex}",
+                name=f"import {i}",
+                email=None,
+                projects=None,
+                hashed_password="",
+                sign_dt=now,
+                update_dt=now,
+                login_dt=now
+            ) for i in range(3)
+        ]
+
+        renamed = CreateUserDTO(**{**users[0].__dict__, "name": "renamed"})
+
+        async with AsyncSession(engine) as session:
+            mapper = UserMapper(session)
+
+            assert await mapper.upsert_many(users) == 3
+            await session.commit()
+
+            assert await mapper.upsert_many([users[0], renamed]) == 1
+            await session.commit()
+
+            assert (await mapper.get(users[0].ident)).name == "renamed"
+            assert (await mapper.get(users[1].ident)).name == "import 1"
+
+
+    @pytest.mark.anyio
+    async def test_second_permission_row_is_rejected(self):
+        now = datetime.now()
+        user = CreateUserDTO(ident=uuid4(), login=f"dup-{uuid4().hex}", name="dup", email=None, projects=None, hashed_password="", sign_dt=now, update_dt=now, login_dt=now)
+
+        async with AsyncSession(engine) as session:
+            await UserMapper(session).upsert_many([user])
+
+            session.add_all(
+                PermissionModel(ident=uuid4(), user_ident=user.ident, **{name: value for name in PERMISSION_FLAGS})
+                for value in (True, False)
+            )
+
+            with pytest.raises(IntegrityError):
+                await session.flush()
+
+            await session.rollback()
@@ -1,8 +1,17 @@
+from uuid import UUID
 from httpx import Cookies, AsyncClient
 import pytest
 from copy import copy
 
+from prometheus_client import REGISTRY
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from storage import storage
+from utils import engine
+from app.infrastructure.database.mappers import UserMapper
+from app.infrastructure.services.jwt_service import JwtService
+from app.infrastructure.redis.setup import create_redis
+from app.infrastructure.redis.redis_mapper import RedisMapper
 from app.application.dto import UserDTO, RefreshTokenDTO
 
 
@@ -118,6 +127,9 @@ class TestAuthEndpoints:
 
         assert res.status_code == 200
 
+        async with AsyncSession(engine) as session:
+            assert (await UserMapper(session).get(user["ident"])).hashed_password.startswith("$scrypt$")
+
         client.cookies = Cookies(
             {
                 "access_token": res.cookies.get("access_token"),
@@ -309,11 +321,161 @@ class TestAuthEndpoints:
             assert res.status_code == 403
 
 
+    @pytest.mark.anyio
+    async def test_validate_access_batch(self, client: AsyncClient):
+        user = storage.fake_users_dicts[1]
+        permissions = storage.get_user_permission(user["ident"])
+
+        res = await client.post(
+            "auth/v1/login",
+            json={
+                "login": user["login"],
+                "password": user["password"]
+            }
+        )
+
+        client.cookies = Cookies(
+            {
+                "access_token": res.cookies.get("access_token"),
+                "refresh_token": res.cookies.get("refresh_token")
+            }
+        )
+
+        checks = [
+            ("GET", "/v1/personal", permissions.personal_data_get),
+            ("POST", "/v1/personal", permissions.personal_data_create),
+            ("DELETE", "/v1/ndt", permissions.ndt_data_delete),
+            ("PATCH", "/v1/acst", permissions.acst_data_update),
+            ("GET", "/v1/unknown", False)
+        ]
+
+        res = await client.post(
+            "auth/v1/validate-access/batch",
+            json={
+                "checks": [{"method": method, "uri": uri} for method, uri, _ in checks]
+            }
+        )
+
+        assert res.status_code == 200
+        assert [el["allowed"] for el in res.json()["results"]] == [allowed for _, _, allowed in checks]
+
+
+    @pytest.mark.anyio
+    async def test_cached_validate_access_skips_database(self, client: AsyncClient):
+        user = storage.get_fake_superuser_dict()
+
+        res = await client.post(
+            "auth/v1/login",
+            json={
+                "login": user["login"],
+                "password": user["password"]
+            }
+        )
+
+        client.cookies = Cookies(
+            {
+                "access_token": res.cookies.get("access_token"),
+                "refresh_token": res.cookies.get("refresh_token")
+            }
+        )
+
+        res = await client.post("auth/v1/validate-access")
+
+        assert res.status_code == 200
+
+        checkouts = REGISTRY.get_sample_value("auth_db_pool_wait_seconds_count")
+
+        res = await client.post("auth/v1/validate-access")
+
+        assert res.status_code == 200
+        assert REGISTRY.get_sample_value("auth_db_pool_wait_seconds_count") == checkouts
+        assert REGISTRY.get_sample_value("auth_db_pool_checked_out_connections") == 0
+
+
+    @pytest.mark.anyio
+    async def test_me(self, client: AsyncClient):
+        res = await client.post(
+            "auth/v1/me"
+        )
+
+        assert res.status_code == 200
+
+        data = res.json()
+
+        assert UUID(data["ident"]).hex == JwtService().read_access_token(client.cookies["access_token"])["user_ident"]
+        assert "hashedPassword" not in data
+        assert "hashed_password" not in data
+
+
     @pytest.mark.anyio
     async def test_logout(self, client: AsyncClient):
+        refresh_token_ident = JwtService().read_refresh_token(client.cookies["refresh_token"])["ident"]
 
         res = await client.post(
-            "auth/v1/logout"
+            "auth/v1/me"
+        )
+
+        assert res.status_code == 200
+
+        async with create_redis() as redis:
+            assert await redis.exists(f"refresh-token:{refresh_token_ident.hex}")
+
+            res = await client.post(
+                "auth/v1/logout"
+            )
+
+            assert res.status_code == 200
+            assert await RedisMapper(redis).get_refresh_token(refresh_token_ident) is None
+
+
+    @pytest.mark.anyio
+    async def test_jwks(self, client: AsyncClient):
+
+        res = await client.get(
+            "auth/v1/.well-known/jwks.json"
         )
 
-        assert res.status_code == 200
\ No newline at end of file
+        assert res.status_code == 200
+        assert "max-age" in res.headers["cache-control"]
+        assert isinstance(res.json()["keys"], list)
+
+
+    @pytest.mark.anyio
+    async def test_replayed_refresh_token_revokes_cached_tokens(self, client: AsyncClient):
+        user = storage.fake_users_dicts[2]
+
+        res = await client.post(
+            "auth/v1/login",
+            json={
+                "login": user["login"],
+                "password": user["password"]
+            }
+        )
+
+        replayed_refresh_token = res.cookies.get("refresh_token")
+
+        client.cookies = Cookies({"refresh_token": replayed_refresh_token})
+
+        res = await client.post("auth/v1/update-tokens")
+
+        assert res.status_code == 200
+
+        live_refresh_token = res.cookies.get("refresh_token")
+        live_refresh_token_ident = JwtService().read_refresh_token(live_refresh_token)["ident"]
+
+        client.cookies = Cookies({"refresh_token": live_refresh_token})
+
+        assert (await client.post("auth/v1/authenticate")).status_code == 200
+
+        async with create_redis() as redis:
+            assert await RedisMapper(redis).get_refresh_token(live_refresh_token_ident) is not None
+
+            client.cookies = Cookies({"refresh_token": replayed_refresh_token})
+
+            assert (await client.post("auth/v1/authenticate")).status_code == 403
+
+            assert await RedisMapper(redis).get_refresh_token(live_refresh_token_ident) is None
+
+        client.cookies = Cookies({"refresh_token": live_refresh_token})
+
+        assert (await client.post("auth/v1/authenticate")).status_code == 403
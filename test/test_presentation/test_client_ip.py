@@ -0,0 +1,40 @@
+import pytest
+from fastapi import Request
+
+from app.presentation.routes.auth import get_client_ip
+
+
+def make_request(host: str, forwarded_for: str | None = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for is not None else []
+
+    return Request({"type": "http", "client": (host, 12345), "headers": headers})
+
+
+class TestGetClientIp:
+
+    @pytest.fixture(autouse=True)
+    def trusted_proxies(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TRUSTED_PROXIES", "10.0.0.0/8, 192.168.1.1")
+
+
+    @pytest.mark.parametrize(
+        "host, forwarded_for, expected",
+        [
+            ("203.0.113.7", None, "203.0.113.7"),
+            ("203.0.113.7", "198.51.100.1", "203.0.113.7"),
+            ("10.0.0.5", None, "10.0.0.5"),
+            ("10.0.0.5", "198.51.100.1", "198.51.100.1"),
+            ("10.0.0.5", "1.1.1.1, 198.51.100.1", "198.51.100.1"),
+            ("10.0.0.5", "198.51.100.1, 192.168.1.1", "198.51.100.1"),
+            ("10.0.0.5", "10.1.1.1, 10.2.2.2", "10.1.1.1"),
+            ("10.0.0.5", " , ", "10.0.0.5")
+        ]
+    )
+    def test_get_client_ip(self, host: str, forwarded_for: str | None, expected: str):
+        assert get_client_ip(make_request(host, forwarded_for)) == expected
+
+
+    def test_no_trusted_proxies(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.delenv("TRUSTED_PROXIES")
+
+        assert get_client_ip(make_request("10.0.0.5", "198.51.100.1")) == "10.0.0.5"
@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+from prometheus_client.mmap_dict import MmapedDict, mmap_key
+
+
+class TestMetricsEndpoint:
+
+    @pytest.mark.anyio
+    async def test_metrics(self, client: AsyncClient):
+        await client.get("auth/v1/.well-known/jwks.json")
+
+        res = await client.get("metrics")
+
+        assert res.status_code == 200
+        assert 'auth_request_seconds_count{method="GET",route="/auth/v1/.well-known/jwks.json",status="200"}' in res.text
+        assert "auth_stage_seconds" in res.text
+
+
+    @pytest.mark.anyio
+    async def test_multiprocess_metrics(self, client: AsyncClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        for pid, value in ((1, 2), (2, 3)):
+            values = MmapedDict(str(tmp_path / f"counter_{pid}.db"))
+            values.write_value(mmap_key("auth_worker_test", "auth_worker_test_total", ["worker"], ["any"], "test"), value, 0)
+            values.close()
+
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+        res = await client.get("metrics")
+
+        assert res.status_code == 200
+        assert 'auth_worker_test_total{worker="any"} 5.0' in res.text
+        assert "auth_request_seconds" not in res.text
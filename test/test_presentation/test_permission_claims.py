@@ -0,0 +1,128 @@
+from datetime import datetime
+from uuid import uuid4
+import asyncio
+
+import pytest
+from httpx import Cookies, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.dto import CreateUserDTO, CreatePermissionDTO
+from app.application.common.permissions import PERMISSION_FLAGS
+from app.infrastructure.database.mappers import UserMapper, PermissionMapper
+from app.infrastructure.redis.redis_mapper import RedisMapper
+from app.infrastructure.services.hasher import PasswordHasher
+
+from utils import engine
+
+
+PASSWORD = "QWE123df"
+
+
+def make_user(projects: list[str] | None, **flags: bool) -> tuple[CreateUserDTO, CreatePermissionDTO]:
+    now = datetime.now()
+    user = CreateUserDTO(
+        ident=uuid4(),
+        login=f"claims-{uuid4().hex}",
+        name="claims",
+        email=None,
+        projects=projects,
+        hashed_password=PasswordHasher(log_n=10, r=8, p=1).hash(PASSWORD),
+        sign_dt=now,
+        update_dt=now,
+        login_dt=now
+    )
+    permission = CreatePermissionDTO(ident=uuid4(), user_ident=user.ident, **{name: flags.get(name, False) for name in PERMISSION_FLAGS})
+
+    return user, permission
+
+
+USER = make_user(["first"], ndt_data_get=True)
+SUPERUSER = make_user(None, is_super_user=True)
+
+
+@pytest.fixture(scope="module")
+def add_claims_users(prepare_db):
+
+    async def add_claims_users_async():
+        async with AsyncSession(engine) as session:
+            await UserMapper(session).upsert_many([USER[0], SUPERUSER[0]])
+            await PermissionMapper(session).upsert_many([USER[1], SUPERUSER[1]])
+            await session.commit()
+
+    asyncio.run(add_claims_users_async())
+
+
+@pytest.fixture
+def claims_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ACCESS_TOKEN_PERMISSION_CLAIMS", "true")
+
+
+async def login(client: AsyncClient, user: CreateUserDTO, monkeypatch: pytest.MonkeyPatch) -> None:
+    res = await client.post(
+        "auth/v1/login",
+        json={
+            "login": user.login,
+            "password": PASSWORD
+        }
+    )
+
+    assert res.status_code == 200
+
+    client.cookies = Cookies({"access_token": res.cookies.get("access_token")})
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("principal fetched while permission claims are embedded in the access token")
+
+    monkeypatch.setattr(RedisMapper, "get_principal", fail)
+    monkeypatch.setattr(UserMapper, "get", fail)
+    monkeypatch.setattr(PermissionMapper, "get_mask_by_user_ident", fail)
+
+
+@pytest.mark.usefixtures("add_claims_users", "claims_mode")
+class TestAccessTokenPermissionClaims:
+
+    @pytest.mark.anyio
+    async def test_allowed_without_principal_fetch(self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch):
+        await login(client, USER[0], monkeypatch)
+
+        res = await client.post(
+            "auth/v1/validate-access",
+            headers={
+                "x-original-method": "GET",
+                "x-original-uri": "/v1/ndt"
+            }
+        )
+
+        assert res.status_code == 200
+        assert res.headers["X-User-Projects"] == "first"
+
+
+    @pytest.mark.anyio
+    async def test_forbidden(self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch):
+        await login(client, USER[0], monkeypatch)
+
+        res = await client.post(
+            "auth/v1/validate-access",
+            headers={
+                "x-original-method": "DELETE",
+                "x-original-uri": "/v1/ndt"
+            }
+        )
+
+        assert res.status_code == 403
+
+
+    @pytest.mark.anyio
+    async def test_super_user(self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch):
+        await login(client, SUPERUSER[0], monkeypatch)
+
+        res = await client.post(
+            "auth/v1/validate-access",
+            headers={
+                "x-original-method": "DELETE",
+                "x-original-uri": "/v1/ndt"
+            }
+        )
+
+        assert res.status_code == 200
+        assert res.headers["X-User-Projects"] == "all"
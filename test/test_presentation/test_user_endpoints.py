@@ -6,6 +6,7 @@ from httpx import AsyncClient
 
 from storage import storage
 from app.application.dto import UserDTO
+from app.infrastructure.redis.setup import create_redis
 
 
 @pytest.mark.usefixtures("prepare_db")
@@ -166,6 +167,65 @@ class TestUserEndpoints:
         assert res.status_code == 200
 
 
+    @pytest.mark.anyio
+    async def test_list_users(self, client: AsyncClient):
+        headers = {
+            "x-original-method": "GET",
+            "x-original-uri": "v1/user/list"
+        }
+
+        pages = []
+        params = {"limit": 3}
+
+        while True:
+            res = await client.get("v1/user/list", params=params, headers=headers)
+
+            assert res.status_code == 200
+
+            page = res.json()
+
+            if not page:
+                break
+
+            pages.append(page)
+            params = {"limit": 3, "after_sign_dt": page[-1].get("signDt", page[-1].get("sign_dt")), "after_ident": page[-1]["ident"]}
+
+        idents = [el["ident"] for page in pages for el in page]
+
+        assert len(idents) == len(set(idents))
+        assert {str(user.ident) for user in storage.fake_users} <= set(idents)
+        assert all("hashed_password" not in el and "hashedPassword" not in el for page in pages for el in page)
+
+        res = await client.get("v1/user/list", params={"limit": 1000}, headers=headers | {"accept": "application/x-ndjson"})
+
+        assert res.status_code == 200
+        assert [loads(line)["ident"] for line in res.text.splitlines()] == idents
+
+        for params in ({"after_ident": idents[0]}, {"after_sign_dt": pages[0][0].get("signDt", pages[0][0].get("sign_dt"))}):
+            res = await client.get("v1/user/list", params=params, headers=headers)
+
+            assert res.status_code == 422
+
+
+    @pytest.mark.anyio
+    async def test_get_users(self, client: AsyncClient):
+        idents = [user.ident for user in storage.fake_users[:3]]
+
+        res = await client.get(
+            "v1/user/bulk",
+            params={
+                "ident": idents
+            },
+            headers={
+                "x-original-method": "GET",
+                "x-original-uri": "v1/user/bulk"
+            }
+        )
+
+        assert res.status_code == 200
+        assert {el["ident"] for el in res.json()} == {str(ident) for ident in idents}
+
+
     @pytest.mark.parametrize(
         "ident, data",
         [(user.ident, new_user_data) for user, new_user_data in zip(storage.fake_users[:5], storage.fake_user_generator.generate_test_data(5))]
@@ -190,6 +250,9 @@ class TestUserEndpoints:
         assert res.status_code == 200
         assert res.text == f"user {ident} successfully updated"
 
+        async with create_redis() as redis:
+            assert not await redis.exists(f"user:{ident.hex}", f"permission-mask:{ident.hex}")
+
 
     @pytest.mark.parametrize(
         "user",
@@ -0,0 +1,40 @@
+from io import StringIO
+import json
+
+import pytest
+
+from app.utils.json_stream import iter_json_records
+
+
+RECORDS = [{"ident": i, "login": f"user-{i}", "projects": ["a", "b"]} for i in range(50)]
+
+
+class TestIterJsonRecords:
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+    def test_array(self, chunk_size: int):
+        file = StringIO(json.dumps(RECORDS, indent=2))
+
+        assert list(iter_json_records(file, chunk_size)) == RECORDS
+
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+    def test_ndjson(self, chunk_size: int):
+        file = StringIO("\n".join(json.dumps(el) for el in RECORDS) + "\n")
+
+        assert list(iter_json_records(file, chunk_size)) == RECORDS
+
+
+    def test_empty(self):
+        assert list(iter_json_records(StringIO(""))) == []
+        assert list(iter_json_records(StringIO(" [ ] "))) == []
+
+
+    def test_unterminated_array(self):
+        with pytest.raises(ValueError):
+            list(iter_json_records(StringIO(json.dumps(RECORDS)[:-1]), 7))
+
+
+    def test_truncated_record(self):
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_records(StringIO('{"a": 1}\n{"b": '), 7))
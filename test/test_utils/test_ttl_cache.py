@@ -0,0 +1,39 @@
+from time import time
+
+from app.utils.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+
+    def test_hit_and_miss_counters(self):
+        cache = TTLCache[str, int](maxsize=10, ttl=60)
+
+        assert cache.get("key") is None
+
+        cache.set("key", 1)
+
+        assert cache.get("key") == 1
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+
+    def test_entry_never_outlives_expires_at(self):
+        cache = TTLCache[str, int](maxsize=10, ttl=60)
+
+        cache.set("expired", 1, expires_at=time() - 1)
+
+        assert cache.get("expired") is None
+        assert len(cache) == 0
+
+
+    def test_least_recently_used_is_evicted(self):
+        cache = TTLCache[str, int](maxsize=2, ttl=60)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
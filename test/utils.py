@@ -2,4 +2,4 @@
 from app.infrastructure.database.setup import create_engine
 
 
-engine = create_engine()
\ No newline at end of file
+engine = create_engine(pool_mode="null")
\ No newline at end of file